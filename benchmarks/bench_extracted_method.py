@@ -0,0 +1,159 @@
+"""
+Benchmark regresi untuk controller.extracted_method.
+
+Membuat satu file Kotlin sintetis berisi banyak kelas dan method, lalu
+mengukur waktu ekstraksi serta memastikan nilai FANOUT_type/ATFD_type
+setiap kelas hanya berasal dari method kelas itu sendiri, termasuk untuk
+kelas yang namanya sama (check_same_name_classes). Sebelum benchmark,
+check_atfd_locals memastikan parameter, `it` dan variabel lokal yang menjadi
+receiver tidak dihitung sebagai data asing (ATFD).
+
+Jalankan dari root repo:
+    python benchmarks/bench_extracted_method.py --classes 200 --methods 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from kopyt import Parser  # noqa: E402
+
+from program import controller as ct  # noqa: E402
+
+
+def synthetic_file(classes, methods):
+    """Source Kotlin dengan `classes` kelas, masing-masing `methods` method."""
+    lines = ["package bench.synthetic", ""]
+    for c in range(classes):
+        lines.append(f"class Synthetic{c}(private val repo: Repository) {{")
+        lines.append("    private var counter: Int = 0")
+        lines.append("    val label: String = \"c\"")
+        for m in range(methods):
+            lines.append(f"    fun method{m}(value: Int): Int {{")
+            lines.append("        val local = value + counter")
+            lines.append(f"        Storage.store(local, {m})")
+            if m:
+                lines.append(f"        method{m - 1}(local)")
+            lines.append("        return local")
+            lines.append("    }")
+        lines.append("}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+ATFD_LOCALS_SOURCE = """package bench.atfd
+
+class Holder {
+    private var count = 0
+
+    fun locals(other: Box, list: List<Int>): Int {
+        val local = Box()
+        list.forEach { println(it.size) }
+        other.foo()
+        local.bar
+        return count
+    }
+
+    fun foreign(): Int {
+        return Config.limit + Registry.size
+    }
+}
+"""
+
+
+SAME_NAME_SOURCE = """package bench.samename
+
+class Outer {
+    class Item {
+        fun nested() { Config.value.use() }
+    }
+}
+
+class Item(val first: Int) : AppCompatActivity() {
+    override fun one() { Net.get() }
+}
+
+class Item(val second: Int) {
+    fun two() { Db.query(); Cache.read(); Log.write() }
+}
+"""
+
+
+def check_same_name_classes(temp_dir):
+    """Dua kelas bernama Item (plus Item bersarang) masing-masing mendapat nilai kelasnya sendiri."""
+    file_path = os.path.join(temp_dir, "SameName.kt")
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(SAME_NAME_SOURCE)
+    values = {
+        row["Method"]: (row["FANOUT_type"], row["ATFD_type"], row["DIT_type"], row["NIM_type"])
+        for row in ct.extracted_method(file_path) if row["Class"] == "Item"
+    }
+    # DIT/NIM Item pertama berasal dari AppCompatActivity (tipe eksternal), Item kedua tanpa induk
+    dit = ct.external_dit("AppCompatActivity")
+    assert values == {"one": (1, 1, dit, 1), "two": (3, 3, 0, 0)}, values
+
+
+def check_atfd_locals(temp_dir):
+    """Receiver berupa parameter, `it` lambda dan val lokal tidak menambah ATFD."""
+    file_path = os.path.join(temp_dir, "AtfdLocals.kt")
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(ATFD_LOCALS_SOURCE)
+    class_info = ct.ClassInfo(Parser(ATFD_LOCALS_SOURCE).parse().declarations[0])
+    atfd = {method.name: method.foreign_accesses for method in class_info.methods}
+    assert atfd["locals"] == set(), f"locals: unexpected foreign data {sorted(atfd['locals'])}"
+    assert atfd["foreign"] == {"Config", "Registry"}, f"foreign: {sorted(atfd['foreign'])}"
+    rows = ct.extracted_method(file_path)
+    assert all(row["ATFD_type"] == 2 for row in rows), [row["ATFD_type"] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument("--methods", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="Gagal (exit 1) jika waktu terbaik melebihi batas ini")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        check_atfd_locals(temp_dir)
+        check_same_name_classes(temp_dir)
+
+        file_path = os.path.join(temp_dir, "Synthetic.kt")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(synthetic_file(args.classes, args.methods))
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            rows = ct.extracted_method(file_path)
+            timings.append(time.perf_counter() - start)
+
+    expected_rows = args.classes * args.methods
+    assert len(rows) == expected_rows, f"expected {expected_rows} rows, got {len(rows)}"
+    assert not any(row["Error"] for row in rows), "synthetic file produced error rows"
+
+    per_class = {}
+    for row in rows:
+        per_class.setdefault(row["Class"], []).append(row)
+    for class_name, class_rows in per_class.items():
+        fanout_total = sum(row["FANOUT_method"] for row in class_rows)
+        assert all(row["FANOUT_type"] == fanout_total for row in class_rows), class_name
+        # Setiap method hanya membaca satu data asing (Storage), jadi ATFD_type = jumlah method
+        assert all(row["ATFD_type"] == args.methods for row in class_rows), class_name
+
+    best = min(timings)
+    print(f"extracted_method: {args.classes} classes x {args.methods} methods, "
+          f"{len(rows)} rows, best {best:.3f}s of {args.repeat} "
+          f"({len(rows) / best:.0f} methods/s)")
+
+    if args.max_seconds is not None and best > args.max_seconds:
+        print(f"FAIL: {best:.3f}s exceeds limit of {args.max_seconds:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Generator proyek Kotlin sintetis yang deterministik untuk benchmark.
+
+Dengan parameter dan seed yang sama, isi setiap file selalu identik, sehingga
+hasil benchmark antar commit bisa dibandingkan. Proyek berisi beberapa paket,
+kelas yang saling mewarisi lintas file, properti, dan method dengan body
+berisi percabangan bersarang, pemanggilan method kelas lain dan lambda.
+
+Tulis corpus ke direktori (dari root repo):
+    python benchmarks/corpus.py out/corpus --files 50 --classes 4 --methods 10
+"""
+import argparse
+import io
+import os
+import random
+import zipfile
+from typing import NamedTuple
+
+
+class CorpusSpec(NamedTuple):
+    files: int = 20
+    classes_per_file: int = 3
+    methods_per_class: int = 8
+    body_statements: int = 6
+    nesting_depth: int = 2
+    packages: int = 4
+    seed: int = 1
+
+
+def _statement(rng, depth, indent, locals_, fields):
+    """Satu statement; `depth` > 0 bisa menghasilkan blok bersarang."""
+    pad = "    " * indent
+    target = rng.choice(locals_)
+    field = rng.choice(fields)
+    kind = rng.randrange(6 if depth > 0 else 3)
+
+    if kind == 0:
+        name = f"v{len(locals_)}"
+        locals_.append(name)
+        return [f"{pad}val {name} = {target} + {field} * {rng.randrange(1, 9)}"]
+    if kind == 1:
+        return [f"{pad}repository.store({target}, \"{field}\")"]
+    if kind == 2:
+        return [f"{pad}{field} = helper.compute({target}, {rng.randrange(100)})"]
+
+    inner = [
+        line
+        for _ in range(rng.randrange(1, 3))
+        for line in _statement(rng, depth - 1, indent + 1, list(locals_), fields)
+    ]
+    if kind == 3:
+        return [f"{pad}if ({target} > {field}) {{", *inner, f"{pad}}} else {{",
+                f"{pad}    logger.warn(\"{field}\")", f"{pad}}}"]
+    if kind == 4:
+        return [f"{pad}for (item in items) {{", *inner, f"{pad}}}"]
+    return [f"{pad}when ({target}) {{", f"{pad}    0 -> logger.debug(\"zero\")",
+            f"{pad}    else -> {{", *["    " + line for line in inner], f"{pad}    }}", f"{pad}}}"]
+
+
+def _class_source(rng, spec, class_name, parent, lines):
+    parent_clause = f" : {parent}(repository)" if parent else ""
+    lines.append(f"open class {class_name}(private val repository: Repository){parent_clause} {{")
+    fields = [f"field{i}" for i in range(3)]
+    for field in fields:
+        lines.append(f"    var {field}: Int = {rng.randrange(10)}")
+    lines.append("    private val items = listOf(1, 2, 3)")
+    lines.append("")
+    lines.extend(["    fun getField0(): Int {", "        return field0", "    }"])
+    lines.append("")
+
+    for m in range(spec.methods_per_class):
+        lines.append(f"    fun method{m}(value: Int): Int {{")
+        locals_ = ["value"]
+        for _ in range(spec.body_statements):
+            lines.extend(_statement(rng, spec.nesting_depth, 2, locals_, fields))
+        if m:
+            lines.append(f"        method{rng.randrange(m)}(value)")
+        lines.append("        items.forEach { helper.track(it, value) }")
+        lines.append(f"        return {rng.choice(locals_)}")
+        lines.append("    }")
+        lines.append("")
+    lines.append("}")
+    lines.append("")
+
+
+def generate_sources(spec=CorpusSpec()):
+    """
+    Yields:
+        tuple: (path relatif, isi file) untuk setiap file proyek sintetis.
+    """
+    rng = random.Random(spec.seed)
+    declared = []  # (paket, nama kelas) yang sudah dibuat, kandidat superclass
+
+    for f in range(spec.files):
+        package = f"bench.module{f % spec.packages}"
+        lines = [f"package {package}", ""]
+        imports = set()
+        classes = []
+        for c in range(spec.classes_per_file):
+            class_name = f"Synthetic{f}x{c}"
+            parent = None
+            if declared and rng.random() < 0.5:
+                parent_package, parent = rng.choice(declared)
+                if parent_package != package:
+                    imports.add(f"import {parent_package}.{parent}")
+            classes.append((class_name, parent))
+            declared.append((package, class_name))
+
+        lines.extend(sorted(imports))
+        lines.append("")
+        for class_name, parent in classes:
+            _class_source(rng, spec, class_name, parent, lines)
+
+        path = os.path.join("app", "src", "main", "java", *package.split("."), f"File{f}.kt")
+        yield path.replace(os.sep, "/"), "\n".join(lines)
+
+
+def write_project(directory, spec=CorpusSpec()):
+    """Tulis proyek sintetis ke `directory`; mengembalikan (jumlah file, jumlah baris)."""
+    files = lines = 0
+    for path, content in generate_sources(spec):
+        full_path = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        files += 1
+        lines += content.count("\n") + 1
+    return files, lines
+
+
+def project_zip(spec=CorpusSpec()):
+    """Proyek sintetis sebagai isi arsip ZIP (bytes), seperti hasil upload."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path, content in generate_sources(spec):
+            zf.writestr(f"SyntheticProject/{path}", content)
+    return buffer.getvalue()
+
+
+def add_spec_arguments(parser):
+    defaults = CorpusSpec()
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--classes", type=int, default=defaults.classes_per_file, help="Kelas per file")
+    parser.add_argument("--methods", type=int, default=defaults.methods_per_class, help="Method per kelas")
+    parser.add_argument("--body", type=int, default=defaults.body_statements, help="Statement per body method")
+    parser.add_argument("--depth", type=int, default=defaults.nesting_depth, help="Kedalaman blok bersarang")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args):
+    return CorpusSpec(
+        files=args.files,
+        classes_per_file=args.classes,
+        methods_per_class=args.methods,
+        body_statements=args.body,
+        nesting_depth=args.depth,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    files, lines = write_project(args.directory, spec_from_args(args))
+    print(f"{files} files, {lines} lines -> {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
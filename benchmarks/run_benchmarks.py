@@ -0,0 +1,199 @@
+"""
+Benchmark suite untuk pipeline ekstraksi metrik.
+
+Membuat proyek Kotlin sintetis (benchmarks/corpus.py), lalu mengukur
+extracted_method, extract_and_parse, analyze_kotlin_files_per_function dan
+calculate_complexity_report: waktu terbaik, throughput (file/s, LOC/s) dan
+puncak memori (tracemalloc, diukur pada run terpisah agar tidak memperlambat
+pengukuran waktu). Hasil dibandingkan dengan benchmarks/baseline.json; run
+gagal (exit 1) jika ada yang lebih lambat/boros dari baseline melebihi toleransi.
+
+Jalankan dari root repo:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --preset medium --repeat 3
+    python benchmarks/run_benchmarks.py --save-baseline
+
+Baseline bergantung pada mesin; simpan ulang dengan --save-baseline setelah
+pindah mesin atau setelah perubahan yang memang mengubah performa.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import CorpusSpec, add_spec_arguments, project_zip, spec_from_args, write_project  # noqa: E402
+from program import controller as ct  # noqa: E402
+from program.ingest import iter_kotlin_paths  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+PRESETS = {
+    "small": CorpusSpec(files=12, classes_per_file=2, methods_per_class=6, body_statements=5, nesting_depth=2),
+    "medium": CorpusSpec(files=60, classes_per_file=3, methods_per_class=8, body_statements=6, nesting_depth=3),
+    "large": CorpusSpec(files=200, classes_per_file=4, methods_per_class=10, body_statements=8, nesting_depth=3),
+}
+
+CASES = (
+    "extracted_method",
+    "extract_and_parse",
+    "analyze_kotlin_files_per_function",
+    "calculate_complexity_report",
+)
+
+
+def load_main():
+    """Muat main.py (script Streamlit) sebagai modul untuk memanggil fungsi analisisnya."""
+    spec = importlib.util.spec_from_file_location("kotlin_metrics_main", os.path.join(REPO_ROOT, "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_cases(main_module, project_dir, zip_path):
+    kotlin_paths = [os.path.join(project_dir, path) for path in iter_kotlin_paths(project_dir)]
+    return {
+        "extracted_method": lambda: [ct.extracted_method(path) for path in kotlin_paths],
+        # workers=1 supaya semua alokasi terjadi di proses ini dan terukur oleh tracemalloc
+        "extract_and_parse": lambda: ct.extract_and_parse(zip_path, workers=1),
+        "analyze_kotlin_files_per_function": lambda: main_module.analyze_kotlin_files_per_function(
+            zip_path, "SyntheticProject"
+        ),
+        "calculate_complexity_report": lambda: main_module.calculate_complexity_report(project_dir),
+    }
+
+
+def measure(function, repeat):
+    """Waktu terbaik dari `repeat` run dan puncak memori (MB) dari satu run tambahan."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak / (1024 * 1024)
+
+
+def run_suite(spec, repeat, only=None):
+    """Jalankan semua case pada corpus `spec`; mengembalikan dict hasil per case."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        project_dir = os.path.join(work_dir, "SyntheticProject")
+        files, lines = write_project(project_dir, spec)
+
+        zip_path = os.path.join(work_dir, "SyntheticProject.zip")
+        with open(zip_path, "wb") as f:
+            f.write(project_zip(spec))
+
+        main_module = load_main()
+        cases = build_cases(main_module, project_dir, zip_path)
+        results = {}
+        for name in CASES:
+            if only and name not in only:
+                continue
+            seconds, peak_mb = measure(cases[name], repeat)
+            results[name] = {
+                "seconds": round(seconds, 4),
+                "files_per_s": round(files / seconds, 2),
+                "loc_per_s": round(lines / seconds, 1),
+                "peak_mb": round(peak_mb, 2),
+            }
+
+    return {"files": files, "lines": lines, "results": results}
+
+
+def compare(results, baseline, tolerance):
+    """List pesan regresi: case yang waktu atau memorinya melebihi baseline * (1 + tolerance)."""
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for key in ("seconds", "peak_mb"):
+            limit = reference[key] * (1 + tolerance)
+            if current[key] > limit:
+                regressions.append(
+                    f"{name}: {key} {current[key]} > baseline {reference[key]} (+{tolerance:.0%})"
+                )
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small",
+                        help="Ukuran corpus (diabaikan jika --custom dipakai)")
+    parser.add_argument("--custom", action="store_true",
+                        help="Pakai --files/--classes/--methods/--body/--depth/--seed alih-alih preset")
+    add_spec_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=CASES, help="Hanya jalankan case tertentu")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Batas regresi relatif terhadap baseline (default 0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil run ini sebagai baseline")
+    parser.add_argument("--json", metavar="PATH", help="Simpan hasil run ini ke file JSON")
+    args = parser.parse_args()
+
+    name = "custom" if args.custom else args.preset
+    spec = spec_from_args(args) if args.custom else PRESETS[args.preset]
+    suite = run_suite(spec, args.repeat, args.only)
+
+    print(f"corpus {name}: {suite['files']} files, {suite['lines']} lines, best of {args.repeat}")
+    print(f"{'case':38} {'seconds':>9} {'files/s':>9} {'LOC/s':>11} {'peak MB':>9}")
+    for case, result in suite["results"].items():
+        print(f"{case:38} {result['seconds']:9.3f} {result['files_per_s']:9.1f} "
+              f"{result['loc_per_s']:11.0f} {result['peak_mb']:9.2f}")
+
+    entry = {"spec": spec._asdict(), **suite}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({name: entry}, f, indent=2)
+
+    baselines = load_baseline(args.baseline)
+    if args.save_baseline:
+        baselines[name] = entry
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline '{name}' saved to {args.baseline}")
+        return 0
+
+    reference = baselines.get(name)
+    if reference is None:
+        print(f"no baseline '{name}' in {args.baseline}; run with --save-baseline to create one")
+        return 0
+    if reference["spec"] != entry["spec"]:
+        print(f"baseline '{name}' was recorded with a different corpus spec; skipping comparison")
+        return 0
+
+    regressions = compare(suite["results"], reference["results"], args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print(f"no regressions against baseline '{name}' (tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
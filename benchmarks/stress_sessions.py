@@ -0,0 +1,87 @@
+"""
+Stress test beberapa sesi yang menjalankan analyze_kotlin_files_per_function bersamaan.
+
+Setiap sesi mendapat proyek sintetis sendiri (seed dan nama proyek berbeda,
+lihat benchmarks/corpus.py). Hasil setiap sesi dihitung dulu secara berurutan
+sebagai referensi, lalu semua sesi dijalankan bersamaan di thread terpisah
+(seperti sesi Streamlit dalam satu proses server) beberapa putaran. Run gagal
+(exit 1) jika ada sesi yang hasilnya berbeda dari referensinya, misalnya
+karena sesi lain menimpa atau menghapus file kerjanya.
+
+Jalankan dari root repo:
+    python benchmarks/stress_sessions.py --sessions 8 --rounds 3
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from run_benchmarks import load_main
+
+from corpus import CorpusSpec, project_zip
+
+
+def session_result(main_module, archive, project_name):
+    """Baris hasil satu sesi tanpa tanggal ekstraksi, supaya bisa dibandingkan antar run."""
+    df = main_module.analyze_kotlin_files_per_function(BytesIO(archive), project_name)
+    return sorted(
+        tuple(value for key, value in sorted(row.items()) if key != "Extraction Date")
+        for row in df.to_dict("records")
+    )
+
+
+def run_stress(sessions, rounds, files):
+    main_module = load_main()
+    projects = [
+        (f"Project{i}", project_zip(CorpusSpec(files=files, classes_per_file=2, methods_per_class=4, seed=i + 1)))
+        for i in range(sessions)
+    ]
+    expected = {name: session_result(main_module, archive, name) for name, archive in projects}
+
+    failures = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        for round_number in range(rounds):
+            # Semua sesi menunggu di barrier supaya analisisnya benar-benar tumpang tindih
+            barrier = threading.Barrier(sessions)
+
+            def run_session(name, archive):
+                barrier.wait()
+                return name, session_result(main_module, archive, name)
+
+            futures = {executor.submit(run_session, name, archive): name for name, archive in projects}
+            for future, name in futures.items():
+                try:
+                    _, result = future.result()
+                except Exception as e:
+                    failures.append(f"round {round_number + 1}, {name}: {type(e).__name__}: {e}")
+                    continue
+                if result != expected[name]:
+                    differing = len(set(result) ^ set(expected[name]))
+                    failures.append(
+                        f"round {round_number + 1}, {name}: {len(result)} rows (expected "
+                        f"{len(expected[name])}), {differing} rows differ from the reference"
+                    )
+    return failures, time.perf_counter() - start, sum(len(rows) for rows in expected.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8, help="Jumlah sesi bersamaan")
+    parser.add_argument("--rounds", type=int, default=3, help="Berapa kali semua sesi dijalankan bersamaan")
+    parser.add_argument("--files", type=int, default=6, help="Jumlah file per proyek sintetis")
+    args = parser.parse_args()
+
+    failures, seconds, rows = run_stress(args.sessions, args.rounds, args.files)
+    print(f"{args.sessions} sessions x {args.rounds} rounds ({rows} rows per round) in {seconds:.2f}s")
+    for message in failures:
+        print(f"MISMATCH {message}")
+    if not failures:
+        print("all sessions produced their own, correct results")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
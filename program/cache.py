@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+
+from .controller import METRIC_SCHEMA_VERSION
+
+# Lokasi default cache, dipakai bersama oleh semua sesi di mesin yang sama
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "kotlin_metrics_cache.sqlite3")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Setelah melewati max_bytes, entri dibuang sampai ukuran turun ke fraksi ini sekaligus,
+# supaya put berikutnya tidak langsung mengevict lagi satu per satu
+EVICT_TO_FRACTION = 0.9
+# Jumlah pembaruan last_used dari get yang ditampung sebelum ditulis dalam satu transaksi
+TOUCH_BATCH_SIZE = 256
+
+
+def content_digest(data):
+    """Hash SHA-256 dari isi file (bytes)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache persisten (SQLite) untuk hasil extract_file per file.
+
+    Kunci cache adalah hash isi file ditambah versi skema metrik, sehingga file
+    yang tidak berubah tidak perlu di-parse ulang dan hasil lama otomatis tidak
+    terpakai ketika perhitungan metrik berubah. Ukuran total dibatasi
+    `max_bytes`; entri yang paling lama tidak dipakai dibuang lebih dulu (LRU).
+
+    Ukuran total disimpan di tabel `meta` dan dijaga trigger, jadi put tidak
+    perlu menjumlahkan seluruh tabel. Waktu pakai dari get ditampung di memori
+    dan ditulis per batch (lihat flush); panggil close() setelah selesai.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES,
+                 schema_version=METRIC_SCHEMA_VERSION):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.schema_version = schema_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched = {}  # key -> waktu get terakhir yang belum ditulis
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " rows TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            # Cache lama tanpa tabel meta: hitung ukuran total sekali saja
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (name, value)"
+                " SELECT 'total_size', COALESCE(SUM(size), 0) FROM results"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS results_size_insert AFTER INSERT ON results BEGIN"
+                " UPDATE meta SET value = value + new.size WHERE name = 'total_size'; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS results_size_update AFTER UPDATE OF size ON results BEGIN"
+                " UPDATE meta SET value = value - old.size + new.size WHERE name = 'total_size'; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS results_size_delete AFTER DELETE ON results BEGIN"
+                " UPDATE meta SET value = value - old.size WHERE name = 'total_size'; END"
+            )
+
+    def _connect(self):
+        # Koneksi baru per operasi agar aman dipakai dari banyak thread/sesi
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _key(self, digest):
+        return f"{self.schema_version}:{digest}"
+
+    def get(self, digest):
+        """Ambil hasil untuk hash isi file, atau None jika tidak ada."""
+        key = self._key(digest)
+        with closing(self._connect()) as conn:
+            found = conn.execute("SELECT rows FROM results WHERE key = ?", (key,)).fetchone()
+
+        with self._lock:
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = time.time()
+            flush = len(self._touched) >= TOUCH_BATCH_SIZE
+        if flush:
+            self.flush()
+        return json.loads(found[0])
+
+    def _take_touched(self):
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        return touched
+
+    def _write_touched(self, conn, touched):
+        conn.executemany(
+            "UPDATE results SET last_used = MAX(last_used, ?) WHERE key = ?",
+            [(used, key) for key, used in touched.items()],
+        )
+
+    def flush(self):
+        """Tulis waktu pakai yang masih ditampung dari get dalam satu transaksi."""
+        touched = self._take_touched()
+        if touched:
+            with closing(self._connect()) as conn, conn:
+                self._write_touched(conn, touched)
+
+    def close(self):
+        """Tulis sisa waktu pakai; cache tetap bisa dipakai lagi setelahnya."""
+        self.flush()
+
+    def put(self, digest, result):
+        """Simpan hasil untuk hash isi file, lalu buang entri lama jika melebihi batas."""
+        payload = json.dumps(result)
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+
+        touched = self._take_touched()
+        with closing(self._connect()) as conn, conn:
+            # Waktu pakai yang tertunda ditulis dulu supaya LRU tidak membuang entri yang baru dibaca
+            self._write_touched(conn, touched)
+            # Upsert (bukan INSERT OR REPLACE) supaya trigger ukuran melihat UPDATE, bukan DELETE diam-diam
+            conn.execute(
+                "INSERT INTO results (key, rows, size, last_used) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET"
+                " rows = excluded.rows, size = excluded.size, last_used = excluded.last_used",
+                (self._key(digest), payload, size, time.time()),
+            )
+            total = self._total_size(conn)
+            if total > self.max_bytes:
+                self._evict(conn, total - int(self.max_bytes * EVICT_TO_FRACTION))
+
+    def _total_size(self, conn):
+        return conn.execute("SELECT value FROM meta WHERE name = 'total_size'").fetchone()[0]
+
+    def _evict(self, conn, excess):
+        """Hapus entri yang paling lama tidak dipakai sampai `excess` byte terbebaskan."""
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if excess <= 0:
+                break
+            victims.append((key,))
+            excess -= size
+        conn.executemany("DELETE FROM results WHERE key = ?", victims)
+
+    def clear(self):
+        """Kosongkan seluruh isi cache dan reset counter."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM results")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self._touched = {}
+
+    def stats(self):
+        """Ringkasan hit/miss dan ukuran cache saat ini."""
+        with closing(self._connect()) as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            size = self._total_size(conn)
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,283 @@
+"""
+Ekstraksi metrik tanpa UI untuk banyak proyek sekaligus.
+
+Contoh:
+    python -m program.cli repos/app1 uploads/app2.zip --output-dir results --format parquet --jobs 8
+    python -m program.cli repos/app1 --format arrow --compression lz4
+    python -m program.cli huge_monorepo.zip --format parquet --stream
+    python -m program.cli repos/app1 --format parquet --class-table
+    python -m program.cli repos/app1 uploads/app2.zip --report
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import controller as ct
+from .export import DEFAULT_COMPRESSION, EXPORT_FORMATS, write_batches, write_export
+from .guard import DEFAULT_BUDGET, ParseBudget
+from .profiling import PipelineStats
+
+OUTPUT_FORMATS = tuple(EXPORT_FORMATS)
+
+
+def project_name(path):
+    """Nama proyek dari path direktori atau arsip (tanpa ekstensi)."""
+    name = os.path.basename(os.path.normpath(path))
+    root, ext = os.path.splitext(name)
+    return root if ext.lower() in (".zip", ".rar") else name
+
+
+def write_results(df, output_path, output_format, compression=DEFAULT_COMPRESSION):
+    """Tulis DataFrame hasil ke CSV, Parquet, Arrow IPC atau JSON Lines (lihat program/export.py)."""
+    write_export(df, output_path, output_format, compression)
+
+
+def class_table_path(output_path):
+    """Path tabel kelas untuk output `output_path`, misalnya results/app.classes.parquet."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.classes{ext}"
+
+
+def complexity_path(output_path):
+    """Path ringkasan kompleksitas untuk laporan `output_path`, misalnya results/app.complexity.json."""
+    root, _ = os.path.splitext(output_path)
+    if root.endswith(".functions"):
+        root = root[:-len(".functions")]
+    return f"{root}.complexity.json"
+
+
+def run_report(path, output_path, output_format, compression=DEFAULT_COMPRESSION, state_path=None):
+    """
+    Jalankan laporan UI tanpa Streamlit untuk satu proyek: NOLV/CYCLO per fungsi
+    (program/report.py) ke `output_path`, serta ringkasan proyek dan laporan
+    kompleksitas (scanner.ProjectScan) ke complexity_path(output_path).
+
+    Jika `state_path` diisi dan `path` adalah direktori, hanya file yang berubah
+    sejak run sebelumnya yang dipindai ulang (incremental.report_directory_incremental).
+
+    Returns:
+        dict: Ringkasan proyek (jumlah fungsi dan file, MCC, durasi dalam detik).
+    """
+    start = time.perf_counter()
+    name = project_name(path)
+    reparsed = None
+    if state_path and os.path.isdir(path):
+        from .incremental import report_directory_incremental
+        df, scan, changes = report_directory_incremental(path, state_path, name)
+        reparsed = len(changes["added"]) + len(changes["changed"])
+    else:
+        from .report import project_report
+        df, scan = project_report(path, name)
+    parse_seconds = time.perf_counter() - start
+
+    write_results(df, output_path, output_format, compression)
+    complexity = scan.complexity()
+    summary_path = complexity_path(output_path)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump({"project": name, "summary": scan.summary(), "complexity": complexity}, f, indent=2)
+
+    return {
+        "project": name,
+        "rows": len(df),
+        "files": len(scan.files),
+        "reparsed_files": reparsed,
+        "mcc_per_1000_lloc": complexity["mcc_per_1000_lloc"],
+        "parse_seconds": round(parse_seconds, 3),
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "output": output_path,
+        "complexity": summary_path,
+    }
+
+
+def run_project(path, output_path, output_format, workers=1, cache_path=None, state_path=None,
+                profile=False, budget=None, compression=DEFAULT_COMPRESSION, stream=False, class_table=False):
+    """
+    Jalankan extract_and_parse untuk satu proyek dan simpan hasilnya.
+
+    Jika `state_path` diisi dan `path` adalah direktori, hanya file yang berubah
+    sejak run sebelumnya yang diproses (lihat program/incremental.py). Jika
+    `profile` True, statistik per tahap disimpan di `<output>.profile.json`.
+    `budget` (ParseBudget) membatasi waktu/memori per file. Jika `stream` True
+    (dan bukan run incremental), baris ditulis per potongan selagi file diparse
+    (controller.iter_row_batches + export.write_batches), jadi memori tetap
+    datar untuk proyek yang sangat besar. Jika `class_table` True (run biasa),
+    nilai tingkat kelas ditulis sekali per kelas ke class_table_path(output_path)
+    dan output utama hanya berisi kolom method plus `class_id`.
+
+    Returns:
+        dict: Ringkasan proyek (jumlah baris, baris error, durasi dalam detik).
+    """
+    start = time.perf_counter()
+    stats = PipelineStats()
+    cache = None
+    if cache_path:
+        from .cache import ResultCache
+        cache = ResultCache(cache_path)
+
+    reparsed = None
+    if state_path and os.path.isdir(path):
+        from .incremental import extract_directory_incremental
+        df, changes = extract_directory_incremental(
+            path, state_path, workers=workers, cache=cache, stats=stats, budget=budget
+        )
+        reparsed = len(changes["added"]) + len(changes["changed"])
+    elif stream:
+        batches = ct.iter_row_batches(path, workers=workers, cache=cache, stats=stats, budget=budget)
+        written = write_batches(batches, output_path, output_format, compression)
+        df = None
+    elif class_table:
+        columns = ct.extract_archive_columns(path, workers=workers, cache=cache, stats=stats, budget=budget)
+        with stats.stage("write_output"):
+            methods, classes = columns.to_frames()
+            write_results(methods, output_path, output_format, compression)
+            write_results(classes.reset_index(), class_table_path(output_path), output_format, compression)
+        written = {"rows": len(methods), "errors": int((methods["Error"] != "").sum())}
+        df = None
+    else:
+        df = ct.extract_and_parse(path, workers=workers, cache=cache, stats=stats, budget=budget)
+    parse_seconds = time.perf_counter() - start
+    if cache is not None:
+        cache.close()
+    if df is not None:
+        with stats.stage("write_output"):
+            write_results(df, output_path, output_format, compression)
+        written = {
+            "rows": len(df),
+            "errors": int((df["Error"] != "").sum()) if "Error" in df else 0,
+        }
+
+    profile_path = None
+    if profile:
+        profile_path = f"{output_path}.profile.json"
+        stats.dump(profile_path)
+
+    return {
+        "project": project_name(path),
+        "rows": written["rows"],
+        "errors": written["errors"],
+        "reparsed_files": reparsed,
+        "parse_seconds": round(parse_seconds, 3),
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "output": output_path,
+        "profile": profile_path,
+        "slowest_files": stats.slowest_files()[:3],
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m program.cli",
+        description="Ekstraksi metrik Kotlin (extract_and_parse) untuk banyak direktori/arsip.",
+    )
+    parser.add_argument("paths", nargs="+", help="Direktori proyek atau arsip ZIP/RAR")
+    parser.add_argument("-o", "--output-dir", default="results", help="Direktori output (default: results)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="csv",
+                        help="Format output; parquet/arrow menyimpan tipe kolom dan paling cepat dibaca ulang")
+    parser.add_argument("--compression", choices=("zstd", "lz4", "none"), default=DEFAULT_COMPRESSION,
+                        help="Kompresi untuk parquet/arrow (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Jumlah proyek yang diproses paralel (default: jumlah core)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Jumlah proses parser per proyek (default: 1)")
+    parser.add_argument("--cache", metavar="PATH", default=None,
+                        help="File SQLite untuk cache hasil per file (lihat program/cache.py)")
+    parser.add_argument("--incremental", metavar="STATE_DIR", default=None,
+                        help="Simpan manifest per proyek di STATE_DIR dan proses ulang hanya file "
+                             "yang berubah (khusus input direktori, juga untuk --report)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Tulis hasil per potongan selagi file diparse, tanpa menyimpan seluruh "
+                             "hasil di memori (diabaikan bersama --incremental)")
+    parser.add_argument("--class-table", action="store_true",
+                        help="Tulis nilai tingkat kelas sekali per kelas ke <output>.classes.<ext>; output "
+                             "utama berisi kolom method plus class_id (diabaikan bersama --stream/--incremental)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Simpan waktu per tahap/metrik dan file paling lambat ke <output>.profile.json")
+    parser.add_argument("--report", action="store_true",
+                        help="Alih-alih extract_and_parse, tulis laporan NOLV/CYCLO per fungsi ke "
+                             "<proyek>.functions.<ext> dan ringkasan/kompleksitas ke <proyek>.complexity.json")
+    parser.add_argument("--file-timeout", type=float, default=DEFAULT_BUDGET.seconds, metavar="SECONDS",
+                        help="Batas waktu per file; file yang melewatinya ditandai di kolom Error "
+                             "(default: %(default)s, 0 = tanpa batas)")
+    parser.add_argument("--file-memory-mb", type=int, default=DEFAULT_BUDGET.memory_mb, metavar="MB",
+                        help="Batas memori per file, khusus Unix (default: %(default)s, 0 = tanpa batas)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    tasks = {}
+    used_names = set()
+    for path in args.paths:
+        if not os.path.exists(path):
+            print(f"skip {path}: not found", file=sys.stderr)
+            continue
+        # Proyek dengan nama sama (misalnya dari folder berbeda) tidak saling menimpa
+        name = project_name(path)
+        unique_name, suffix = name, 2
+        while unique_name in used_names:
+            unique_name, suffix = f"{name}_{suffix}", suffix + 1
+        used_names.add(unique_name)
+        if args.report:
+            # Output dan manifest laporan tidak menimpa milik ekstraksi proyek yang sama
+            unique_name = f"{unique_name}.functions"
+        state_path = os.path.join(args.incremental, f"{unique_name}.json") if args.incremental else None
+        extension = EXPORT_FORMATS[args.format][0]
+        tasks[path] = (os.path.join(args.output_dir, f"{unique_name}.{extension}"), state_path)
+
+    budget = ParseBudget(seconds=args.file_timeout or None, memory_mb=args.file_memory_mb or None)
+    compression = None if args.compression == "none" else args.compression
+
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(tasks) or 1))) as executor:
+        if args.report:
+            futures = {
+                executor.submit(run_report, path, output_path, args.format, compression, state_path): path
+                for path, (output_path, state_path) in tasks.items()
+            }
+        else:
+            futures = {
+                executor.submit(
+                    run_project, path, output_path, args.format, args.workers, args.cache, state_path,
+                    args.profile, budget, compression, args.stream, args.class_table,
+                ): path
+                for path, (output_path, state_path) in tasks.items()
+            }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"FAIL {path}: {e}", file=sys.stderr)
+                continue
+            reparsed = ""
+            if summary["reparsed_files"] is not None:
+                reparsed = f"{summary['reparsed_files']} files re-parsed, "
+            if args.report:
+                print(
+                    f"{summary['project']}: {summary['rows']} function rows, {summary['files']} files, {reparsed}"
+                    f"MCC/1000 LLOC {summary['mcc_per_1000_lloc']:.2f}, parse {summary['parse_seconds']:.2f}s, "
+                    f"total {summary['total_seconds']:.2f}s -> {summary['output']}, {summary['complexity']}"
+                )
+                continue
+            print(
+                f"{summary['project']}: {summary['rows']} rows, {summary['errors']} errors, {reparsed}"
+                f"parse {summary['parse_seconds']:.2f}s, total {summary['total_seconds']:.2f}s "
+                f"-> {summary['output']}"
+            )
+            if summary["profile"]:
+                slowest = ", ".join(f"{file} {seconds:.2f}s" for file, seconds in summary["slowest_files"])
+                print(f"  profile -> {summary['profile']} (slowest: {slowest or '-'})")
+
+    print(f"{len(tasks) - failed}/{len(tasks)} projects done in {time.perf_counter() - start:.2f}s")
+    return 1 if failed or len(tasks) < len(args.paths) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+from array import array
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# Kolom hasil extract_file beserta tipenya, sesuai urutan kolom DataFrame:
+# "category" disimpan sebagai kode int32 + daftar nilai unik, "str" sebagai list,
+# selain itu typecode array.array ("q" = int64, "d" = float64).
+RESULT_COLUMNS = (
+    ("Package", "category"),
+    ("Class", "category"),
+    ("Method", "str"),
+    ("LOC", "q"),
+    ("NOMNAMM_type", "q"),
+    ("NOA_type", "q"),
+    ("NIM_type", "q"),
+    ("ATFD_type", "q"),
+    ("DIT_type", "q"),
+    ("FANOUT_type", "q"),
+    ("FANOUT_method", "q"),
+    ("ATLD_method", "d"),
+    ("CFNAMM_method", "d"),
+    ("Error", "str"),
+)
+
+# Kolom tingkat kelas: nilainya sama untuk semua method satu kelas, jadi disimpan
+# sekali per kelas di tabel kelas; sisanya kolom per method.
+CLASS_COLUMNS = ("Package", "Class", "NOMNAMM_type", "NOA_type", "NIM_type", "ATFD_type", "DIT_type", "FANOUT_type")
+METHOD_COLUMNS = tuple(name for name, _ in RESULT_COLUMNS if name not in CLASS_COLUMNS)
+
+
+class ClassRecord(NamedTuple):
+    """Nilai tingkat kelas satu kelas hasil extract_file, urutannya sama dengan CLASS_COLUMNS."""
+    Package: str
+    Class: str
+    NOMNAMM_type: int
+    NOA_type: int
+    NIM_type: int
+    ATFD_type: int
+    DIT_type: int
+    FANOUT_type: int
+
+
+class MethodRecord(NamedTuple):
+    """
+    Satu baris method hasil extract_file: indeks kelasnya di tabel kelas file
+    yang sama, lalu kolom METHOD_COLUMNS.
+    """
+    class_index: int
+    Method: str
+    LOC: int
+    FANOUT_method: int
+    ATLD_method: float
+    CFNAMM_method: float
+    Error: str
+
+_NUMPY_TYPES = {"q": np.int64, "d": np.float64, "i": np.int32}
+
+
+def _to_numpy(values):
+    """Salinan numpy dari array.array; salinan supaya array masih bisa bertambah setelahnya."""
+    return np.array(values, dtype=_NUMPY_TYPES[values.typecode])
+
+
+def _take_array(values, take):
+    """array.array baru berisi `values[take]` dengan typecode yang sama."""
+    taken = array(values.typecode)
+    taken.frombytes(_to_numpy(values)[take].tobytes())
+    return taken
+
+
+def _take_column(column, kind, take):
+    """Kolom akumulasi baru berisi `column[take]` (lihat _new_column)."""
+    if kind == "category":
+        taken = _CategoryColumn()
+        taken.codes = _take_array(column.codes, take)
+        taken.values = column.values
+        taken._index = column._index
+        return taken
+    if kind == "str":
+        return [column[i] for i in take]
+    return _take_array(column, take)
+
+
+class _CategoryColumn:
+    __slots__ = ("codes", "values", "_index")
+
+    def __init__(self):
+        self.codes = array("i")
+        self.values = []
+        self._index = {}
+
+    def _code(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self._code(value))
+
+    def __setitem__(self, position, value):
+        self.codes[position] = self._code(value)
+
+
+def _new_column(kind):
+    if kind == "category":
+        return _CategoryColumn()
+    if kind == "str":
+        return []
+    return array(kind)
+
+
+def _pandas_column(column, kind, take=None):
+    """Kolom untuk DataFrame; `take` (array id grup per baris) memperluas kolom grup ke setiap baris."""
+    if kind == "category":
+        codes = _to_numpy(column.codes)
+        return pd.Categorical.from_codes(codes if take is None else codes[take], categories=column.values)
+    if kind == "str":
+        return column if take is None else [column[i] for i in take]
+    values = _to_numpy(column)
+    return values if take is None else values[take]
+
+
+def _arrow_column(column, kind, take=None):
+    import pyarrow as pa
+
+    if kind == "category":
+        codes = _to_numpy(column.codes)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(codes if take is None else codes[take]), pa.array(column.values, type=pa.string())
+        )
+    if kind == "str":
+        return pa.array(column if take is None else [column[i] for i in take], type=pa.string())
+    values = _to_numpy(column)
+    return pa.array(values if take is None else values[take])
+
+
+class RecordColumns:
+    """
+    Akumulator struct-of-arrays untuk baris hasil dengan tabel grup terpisah.
+
+    Kolom grup (misalnya nilai tingkat kelas) disimpan sekali per grup di tabel
+    grup; setiap baris hanya menyimpan id grup (int32) plus kolom per baris.
+    Kolom konstan (misalnya tanggal ekstraksi) disimpan sekali saja. to_frame
+    dan to_arrow memperluas tabel grup ke setiap baris (satu tabel datar),
+    to_frames mengembalikan tabel baris dan tabel grup terpisah.
+
+    Args:
+        columns (tuple): (nama, tipe) semua kolom per baris sesuai urutan output;
+            tipe seperti RESULT_COLUMNS.
+        group_columns (tuple): Nama kolom yang disimpan di tabel grup.
+        constants (dict): Optional, nama kolom -> nilai yang sama untuk semua baris;
+            diletakkan paling depan di output sebagai category satu nilai.
+        shared_groups (bool): True jika grup dengan nilai yang sama dipakai bersama
+            (add_group mengembalikan id yang sama); False jika setiap add_group
+            membuat grup baru, misalnya satu grup per kelas.
+    """
+
+    __slots__ = (
+        "_kinds", "_group_names", "_row_names", "_constants", "_groups", "_group_values", "_group_ids", "_columns",
+    )
+
+    def __init__(self, columns, group_columns=(), constants=None, shared_groups=True):
+        self._kinds = dict(columns)
+        self._group_names = tuple(group_columns)
+        self._row_names = tuple(name for name, _ in columns if name not in self._group_names)
+        self._constants = dict(constants or {})
+        self._groups = {} if shared_groups else None  # tuple nilai grup -> id grup
+        self._group_values = []  # id grup -> tuple nilai grup
+        self._group_ids = array("i")
+        self._columns = {name: _new_column(kind) for name, kind in columns}
+
+    def __len__(self):
+        return len(self._group_ids)
+
+    def add_group(self, values):
+        """Id grup untuk `values` (tuple, urutan group_columns)."""
+        if self._groups is not None:
+            group_id = self._groups.get(values)
+            if group_id is not None:
+                return group_id
+            self._groups[values] = len(self._group_values)
+        group_id = len(self._group_values)
+        self._group_values.append(values)
+        for name, value in zip(self._group_names, values):
+            self._columns[name].append(value)
+        return group_id
+
+    def update_group(self, group_id, values):
+        """Ganti kolom grup `values` (dict nama -> nilai) grup `group_id`, untuk semua barisnya."""
+        current = self._group_values[group_id]
+        updated = tuple(values.get(name, value) for name, value in zip(self._group_names, current))
+        if updated == current:
+            return
+        self._group_values[group_id] = updated
+        if self._groups is not None:
+            if self._groups.get(current) == group_id:
+                del self._groups[current]
+            self._groups.setdefault(updated, group_id)
+        for name, value in values.items():
+            self._columns[name][group_id] = value
+
+    def append_row(self, group_id, values):
+        """Tambahkan satu baris untuk grup `group_id`; `values` berurutan sesuai kolom per baris."""
+        self._group_ids.append(group_id)
+        for name, value in zip(self._row_names, values):
+            self._columns[name].append(value)
+
+    def extend_records(self, groups, rows):
+        """
+        Tambahkan record satu unit (misalnya satu file) tanpa dict per baris.
+
+        Args:
+            groups: Tuple/list nilai grup, urutan group_columns.
+            rows: Tuple/list (indeks grup di `groups`, nilai kolom per baris...).
+
+        Returns:
+            list: Id grup untuk setiap item `groups`.
+        """
+        group_ids = [self.add_group(tuple(values)) for values in groups]
+        for row in rows:
+            self.append_row(group_ids[row[0]], row[1:])
+        return group_ids
+
+    def append(self, row):
+        """Tambahkan satu baris dict (kunci semua kolom; kolom konstan tidak perlu ada)."""
+        group_id = self.add_group(tuple(row[name] for name in self._group_names))
+        self.append_row(group_id, [row[name] for name in self._row_names])
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def reorder(self, order):
+        """
+        Susun ulang baris: baris ke-k menjadi baris `order[k]` yang sebelumnya.
+
+        Tabel grup ikut dinomori ulang sesuai baris pertama yang memakainya, jadi
+        urutan kelas di to_frames mengikuti urutan baris yang baru.
+        """
+        take = np.asarray(order, dtype=np.int64)
+        group_ids = _to_numpy(self._group_ids)[take]
+        used, first_row = np.unique(group_ids, return_index=True)
+        group_order = used[np.argsort(first_row)]
+        new_ids = np.zeros(len(self._group_values), dtype=np.int32)
+        new_ids[group_order] = np.arange(len(group_order), dtype=np.int32)
+
+        self._group_ids = array("i")
+        self._group_ids.frombytes(new_ids[group_ids].tobytes())
+        self._group_values = [self._group_values[i] for i in group_order]
+        if self._groups is not None:
+            self._groups = {values: group_id for group_id, values in enumerate(self._group_values)}
+        for name, kind in self._kinds.items():
+            positions = group_order if name in self._group_names else take
+            self._columns[name] = _take_column(self._columns[name], kind, positions)
+
+    def _take(self):
+        return _to_numpy(self._group_ids)
+
+    def _constant_columns(self, length):
+        return {
+            name: pd.Categorical.from_codes(np.zeros(length, dtype=np.int32), categories=[value])
+            for name, value in self._constants.items()
+        }
+
+    def to_frame(self):
+        """DataFrame dengan kolom konstan lalu kolom sesuai urutan `columns`; kolom grup diperluas per baris."""
+        take = self._take()
+        data = self._constant_columns(len(self))
+        for name, kind in self._kinds.items():
+            data[name] = _pandas_column(self._columns[name], kind, take if name in self._group_names else None)
+        return pd.DataFrame(data)
+
+    def to_frames(self, id_column="class_id"):
+        """
+        Tabel baris dan tabel grup sebagai dua DataFrame, tanpa memperluas kolom grup.
+
+        Returns:
+            tuple: (DataFrame baris: `id_column` lalu kolom per baris,
+            DataFrame grup: kolom konstan lalu kolom grup, index = id grup).
+            Tabel datar seperti to_frame didapat dengan
+            ``rows.join(groups, on=id_column)``.
+        """
+        rows = {id_column: self._take()}
+        for name in self._row_names:
+            rows[name] = _pandas_column(self._columns[name], self._kinds[name])
+        groups = self._constant_columns(len(self._group_values))
+        for name in self._group_names:
+            groups[name] = _pandas_column(self._columns[name], self._kinds[name])
+        group_frame = pd.DataFrame(groups)
+        group_frame.index.name = id_column
+        return pd.DataFrame(rows), group_frame
+
+    def to_arrow(self):
+        """
+        pyarrow.Table dengan kolom yang sama seperti to_frame; category sebagai dictionary array.
+
+        Membutuhkan pyarrow (sudah terpasang bersama dukungan Parquet pandas).
+        """
+        import pyarrow as pa
+
+        take = self._take()
+        arrays = {
+            name: pa.DictionaryArray.from_arrays(
+                pa.array(np.zeros(len(self), dtype=np.int32)), pa.array([value], type=pa.string())
+            )
+            for name, value in self._constants.items()
+        }
+        for name, kind in self._kinds.items():
+            arrays[name] = _arrow_column(self._columns[name], kind, take if name in self._group_names else None)
+        return pa.table(arrays)
+
+
+class ResultColumns(RecordColumns):
+    """
+    Akumulator kolom bertipe untuk hasil ekstraksi.
+
+    Nilai tingkat kelas (Package, Class, NOMNAMM/NOA/NIM/ATFD/DIT/FANOUT_type)
+    disimpan sekali per kelas di tabel kelas (id grup = id kelas), Package dan
+    Class sebagai kategori (nama unik sekali saja); setiap method hanya menyimpan
+    id kelas (int32) dan metrik method-nya di array.array yang tumbuh sendiri
+    (int64/float64). Hasil extract_file (ClassRecord/MethodRecord) dimasukkan
+    lewat extend_records tanpa dict per baris, jadi DataFrame tidak perlu
+    menebak tipe kolom. Karena setiap kelas punya grup sendiri, DIT_type/NIM_type
+    yang di-resolve belakangan cukup diganti sekali per kelas (update_group).
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(RESULT_COLUMNS, CLASS_COLUMNS, shared_groups=False)
@@ -1,277 +1,337 @@
 import os
+import pickle
+import re
 import tempfile
-import patoolib
+import time
 import pandas as pd
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from kopyt import Parser, node
-from typing import Set # Import Set untuk type hinting
+from typing import NamedTuple, Set # Import Set untuk type hinting
+from .columns import CLASS_COLUMNS, METHOD_COLUMNS, RESULT_COLUMNS, ClassRecord, MethodRecord, ResultColumns
+from .guard import run_guarded
+from .hierarchy import ClassHierarchy, file_facts, supertype_names
+from .ingest import KotlinSource, SourceRef, decode_source, open_kotlin_sources
+from .profiling import StageTimer, stage
+from .visitor import walk_method
+
+# Naikkan setiap kali perhitungan metrik atau format baris berubah,
+# supaya hasil yang tersimpan di cache (lihat program/cache.py) tidak dipakai lagi.
+METRIC_SCHEMA_VERSION = 9
+
+# Jumlah file yang dikirim ke process pool per worker sekaligus; isi file berikutnya
+# baru dibaca dari arsip saat ada file yang selesai
+POOL_QUEUE_PER_WORKER = 2
+
+# Pesan kolom Error untuk file yang melewati batas memori ParseBudget (program/guard.py)
+MEMORY_LIMIT_ERROR = "Memory limit exceeded while parsing file"
+
+class MethodInfo:
+    """Data satu method yang dipakai bersama oleh semua metrik."""
+
+    __slots__ = (
+        "node", "name", "body_text", "is_accessor_mutator",
+        "foreign_accesses", "external_calls", "atld", "own_calls",
+    )
+
+    def __init__(self, member):
+        self.node = member
+        self.name = member.name
+        # str(body) mahal karena kopyt menyusun ulang source dari AST,
+        # jadi cukup dihitung sekali per method.
+        self.body_text = str(member.body) if member.body else ""
+        self.is_accessor_mutator = False
+        # Diisi oleh ClassInfo setelah satu kali penelusuran AST method ini
+        self.foreign_accesses = set()
+        self.external_calls = set()
+        self.atld = 0.0
+        self.own_calls = set()
+
+    def analyze(self, class_fields, class_methods):
+        """Hitung ATFD, FANOUT, ATLD dan pemanggilan method sendiri dalam satu penelusuran."""
+        foreign = ForeignAccessMetric(class_fields)
+        fanout = ExternalCallMetric(class_methods)
+        atld = LocalDataMetric(class_fields)
+        own_calls = OwnCallMetric(class_methods)
+        walk_method(self.node, (foreign, fanout, atld, own_calls))
+
+        self.foreign_accesses = foreign.result()
+        self.external_calls = fanout.result()
+        self.atld = atld.result()
+        self.own_calls = own_calls.result()
+
+
+class ClassInfo:
+    """
+    Model satu kelas yang dibangun dalam satu kali iterasi member:
+    nama field, method (beserta body-nya), dan klasifikasi accessor/mutator.
+    Semua fungsi count_* membaca dari objek ini alih-alih menelusuri
+    `class_declaration.body.members` berulang kali.
+    """
+
+    def __init__(self, class_declaration):
+        self.declaration = class_declaration
+        self.name = class_declaration.name
+        self.has_body = getattr(class_declaration, 'body', None) is not None
+        self.fields = set()
+        self.methods = []
+        self.method_names = set()
+        self.attribute_count = 0
+        self.override_count = 0
+
+        if not self.has_body:
+            return
 
-def count_nomnamm_type(class_declaration):
+        for member in class_declaration.body.members:
+            if isinstance(member, node.PropertyDeclaration):
+                self.attribute_count += 1
+                decl = getattr(member, 'declaration', None)
+                if isinstance(decl, node.VariableDeclaration):
+                    self.fields.add(decl.name)
+                elif isinstance(decl, node.MultiVariableDeclaration):
+                    for var in decl.sequence:
+                        self.fields.add(var.name)
+            elif isinstance(member, node.VariableDeclaration) and not hasattr(member, 'function'):
+                self.attribute_count += 1
+            elif isinstance(member, node.FunctionDeclaration):
+                self.methods.append(MethodInfo(member))
+                self.method_names.add(member.name)
+                if any(str(modifier).strip() == 'override' for modifier in member.modifiers or ()):
+                    self.override_count += 1
+
+        # Klasifikasi accessor/mutator dan metrik AST butuh semua field dan nama
+        # method, jadi dilakukan setelah iterasi
+        for method in self.methods:
+            method.is_accessor_mutator = _is_accessor_mutator(method, self.fields)
+            method.analyze(self.fields, self.method_names)
+
+    def method_info(self, method_node):
+        for method in self.methods:
+            if method.node is method_node:
+                return method
+        return None
+
+
+# Token identifier dan target assignment `nama = ...` (bukan ==) di body method
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_]\w*")
+_ASSIGNED_RE = re.compile(r"([A-Za-z_]\w*)\s*=(?!=)")
+
+
+def _is_accessor_mutator(method, class_properties):
     """
-    Menghitung jumlah metode yang bukan accessor/mutator (NOMNAMM_type).
-    Lebih akurat dengan memfilter berdasarkan body method yang hanya mengakses properti.
+    Deteksi getter/setter sederhana: nama get/is/set yang mengakses properti kelas.
+
+    Body di-tokenize sekali lalu dicocokkan dengan irisan himpunan, jadi biayanya
+    tidak bergantung pada jumlah properti dan `id` tidak cocok di dalam `valid`.
     """
-    if not hasattr(class_declaration, 'body') or class_declaration.body is None:
-        return 0
-        
-    nomnamm_count = 0
+    function_name = method.name
 
-    class_properties = set()
-
-    # Ambil semua nama property untuk deteksi akses di getter/setter
-    for member in class_declaration.body.members:
-        if isinstance(member, node.PropertyDeclaration):
-            decl = getattr(member, 'declaration', None)
-            if isinstance(decl, node.VariableDeclaration):
-                class_properties.add(decl.name)
-            elif isinstance(decl, node.MultiVariableDeclaration):
-                for var in decl.sequence:
-                    class_properties.add(var.name)
-
-    for member in class_declaration.body.members:
-        if isinstance(member, node.FunctionDeclaration):
-            function_name = member.name
-            body = str(member.body) if member.body else ""
-
-            # Skip constructor (same name as class)
-            if function_name == class_declaration.name:
-                continue
+    if function_name.startswith(("get", "is")):
+        if not class_properties.isdisjoint(_IDENTIFIER_RE.findall(method.body_text)):
+            return True
+
+    if function_name.startswith("set"):
+        if not class_properties.isdisjoint(_ASSIGNED_RE.findall(method.body_text)):
+            return True
+
+    return False
 
-            # Strip whitespace and remove line breaks
-            clean_body = body.replace("\n", "").strip()
 
-            # Possible accessor/mutator detection
-            is_accessor = (
-                function_name.startswith("get") or function_name.startswith("is")
-            ) and any(prop in clean_body for prop in class_properties)
+def count_nomnamm_type(class_declaration, class_info=None):
+    """
+    Menghitung jumlah metode yang bukan accessor/mutator (NOMNAMM_type).
+    Lebih akurat dengan memfilter berdasarkan body method yang hanya mengakses properti.
+    """
+    class_info = class_info or ClassInfo(class_declaration)
+    if not class_info.has_body:
+        return 0
 
-            is_mutator = (
-                function_name.startswith("set") and any(f"{prop} =" in clean_body for prop in class_properties)
-            )
+    nomnamm_count = 0
+    for method in class_info.methods:
+        # Skip constructor (same name as class)
+        if method.name == class_info.name:
+            continue
 
-            if not (is_accessor or is_mutator):
-                nomnamm_count += 1
+        if not method.is_accessor_mutator:
+            nomnamm_count += 1
 
     return nomnamm_count
 
-def count_noa_type(class_declaration):
+def count_noa_type(class_declaration, class_info=None):
     """Menghitung jumlah atribut dalam sebuah kelas (NOA_type)."""
-    if not hasattr(class_declaration, 'body') or class_declaration.body is None:
-        return 0
-        
-    attribute_count = 0
-    for member in class_declaration.body.members:
-        if isinstance(member, node.PropertyDeclaration) or \
-           (isinstance(member, node.VariableDeclaration) and not hasattr(member, 'function')):
-            attribute_count += 1
-    return attribute_count
+    class_info = class_info or ClassInfo(class_declaration)
+    return class_info.attribute_count
 
-def count_nim_type(class_declaration):
+def count_nim_type(class_declaration, class_info=None):
     """
     Menghitung jumlah metode yang diwariskan dari kelas induk (NIM_type).
+
+    Tanpa konteks proyek hanya method override yang terlihat; nilai akhirnya
+    dihitung ulang oleh resolve_file_results dari tabel method ClassHierarchy.
     """
-    if not hasattr(class_declaration, 'body') or class_declaration.body is None:
-        return 0
-        
     # In Kotlin, inherited methods come from:
     # 1. Superclass (Any class by default)
     # 2. Interfaces
     # This is a simplified approach that counts overridden methods
-        
-    nim_count = 0
-        
-    for member in class_declaration.body.members:
-        if isinstance(member, node.FunctionDeclaration):
-            # Check if the method has 'override' modifier
-            if hasattr(member, 'modifiers') and member.modifiers:
-                for modifier in member.modifiers:
-                    if str(modifier).strip() == 'override':
-                        nim_count += 1
-                        break
-        
-    return nim_count
-
-def count_atfd(method_node, class_declaration):
+    class_info = class_info or ClassInfo(class_declaration)
+    return class_info.override_count
+
+# --- Metrik berbasis AST ---
+# Setiap metrik mendaftarkan callback event dari visitor.MethodWalker, sehingga
+# satu penelusuran per method cukup untuk semuanya (lihat MethodInfo.analyze).
+
+class ForeignAccessMetric:
+    """Nama data asing yang diakses method (ATFD)."""
+
+    def __init__(self, current_fields):
+        self.current_fields = current_fields
+        self.receivers = set()
+        self.references = set()
+        # Parameter dan variabel lokal method bukan data asing; `it` adalah parameter lambda implisit
+        self.local_names = {"it"}
+
+    def on_navigation(self, receiver, name, chained):
+        # Navigate through suffixes, e.g., obj.field or obj.method(); hanya awal rantai yang dihitung.
+        # Pemanggilan langsung (foo(), Intent(...)) punya receiver None dan bukan akses data.
+        if not chained and receiver is not None:
+            self.receivers.add(receiver)
+
+    on_call = on_navigation
+
+    def on_identifier(self, name):
+        self.references.add(name)
+
+    def on_declaration(self, name, kind):
+        self.local_names.add(name)
+
+    def result(self):
+        excluded = self.current_fields
+        foreign = {
+            name for name in self.receivers
+            if name not in excluded and name not in self.local_names and name not in ("this", "super")
+        }
+        foreign.update(
+            name for name in self.references
+            if name not in excluded and name not in self.local_names and name != "this"
+        )
+        return foreign
+
+class ExternalCallMetric:
+    """Pemanggilan unik ke class/method lain (FANOUT_method)."""
+
+    def __init__(self, class_methods):
+        self.class_methods = class_methods
+        self.calls = set()
+
+    def on_call(self, receiver, name, chained):
+        if receiver is None:
+            # Direct method calls (no dot)
+            if name not in self.class_methods:
+                self.calls.add(name)
+        elif receiver not in ('this', 'super'):
+            # object.method() or safe-call obj?.method()
+            self.calls.add(f"{receiver}.{name}")
+
+    def result(self):
+        return self.calls
+
+class LocalDataMetric:
+    """Rasio atribut kelas yang diakses terhadap parameter + variabel lokal (ATLD_method)."""
+
+    def __init__(self, class_fields):
+        self.class_fields = class_fields
+        self.attributes_accessed = set()
+        self.local_variables = set()
+
+    def on_identifier(self, name):
+        if name in self.class_fields:
+            self.attributes_accessed.add(name)
+
+    def on_navigation(self, receiver, name, chained):
+        # this.field
+        if receiver == 'this' and not chained and name in self.class_fields:
+            self.attributes_accessed.add(name)
+
+    def on_declaration(self, name, kind):
+        # Parameter serta deklarasi val/var di body dihitung sebagai lokal
+        if kind in ('parameter', 'property'):
+            self.local_variables.add(name)
+
+    def result(self):
+        local_count = len(self.local_variables)
+        attr_count = len(self.attributes_accessed)
+        return round(attr_count / local_count, 2) if local_count > 0 else float(attr_count)
+
+class OwnCallMetric:
+    """Method kelas sendiri yang dipanggil, langsung atau lewat this (dasar CFNAMM_method)."""
+
+    def __init__(self, class_methods):
+        self.class_methods = class_methods
+        self.calls = set()
+
+    def on_call(self, receiver, name, chained):
+        if (receiver is None or (receiver == 'this' and not chained)) and name in self.class_methods:
+            self.calls.add(name)
+
+    def result(self):
+        return self.calls
+
+def _method_info(method_node, class_fields=(), class_methods=()):
+    """MethodInfo untuk method di luar ClassInfo (pemanggilan count_* secara terpisah)."""
+    method = MethodInfo(method_node)
+    method.analyze(set(class_fields), set(class_methods))
+    return method
+
+def count_atfd(method_node, class_declaration, class_info=None):
     """
     Counts Access to Foreign Data (ATFD) for a single method by traversing the AST.
+
+    Seluruh body ditelusuri, termasuk ekspresi di dalam if/when/lambda dan
+    argumen pemanggilan. Yang dihitung adalah nama unik yang menjadi penerima
+    navigasi (obj.field, obj.method()) atau dirujuk langsung, selain field
+    kelas sendiri, `this`, parameter dan variabel lokal method.
     """
-    if not hasattr(method_node, 'body') or not isinstance(method_node.body, node.Block):
+    if getattr(method_node, 'body', None) is None:
         return 0
 
-    foreign_accesses = set()
+    class_info = class_info or ClassInfo(class_declaration)
+    method = class_info.method_info(method_node) or _method_info(method_node, class_info.fields)
+    return len(method.foreign_accesses)
 
-    # Collect current class field names robustly
-    current_fields = set()
-    if hasattr(class_declaration, 'body') and class_declaration.body is not None:
-        for member in class_declaration.body.members:
-            if isinstance(member, node.PropertyDeclaration):
-                decl = getattr(member, 'declaration', None)
-                if isinstance(decl, node.VariableDeclaration):
-                    current_fields.add(decl.name)
-                elif isinstance(decl, node.MultiVariableDeclaration):
-                    for var in decl.sequence:
-                        current_fields.add(var.name)
-
-    def collect_foreign_accesses(expr):
-        if expr is None:
-            return
-            
-        if isinstance(expr, node.PostfixUnaryExpression):
-            # Navigate through suffixes, e.g., obj.field or obj.method()
-            if isinstance(expr.expression, node.Identifier):
-                root_name = expr.expression.value
-                if root_name not in current_fields and root_name != "this":
-                    foreign_accesses.add(root_name)
-            
-            for suffix in expr.suffixes:
-                if isinstance(suffix, node.NavigationSuffix):
-                    if isinstance(expr.expression, node.Identifier):
-                        base = expr.expression.value
-                        if base not in current_fields and base != "this":
-                            foreign_accesses.add(base)
-
-        elif isinstance(expr, node.Assignment):
-            collect_foreign_accesses(expr.value)
-
-        elif isinstance(expr, node.Identifier):
-            if expr.value not in current_fields and expr.value != "this":
-                foreign_accesses.add(expr.value)
-
-        elif hasattr(expr, "_dict_"):
-            for val in vars(expr).values():
-                if isinstance(val, node.Node):
-                    collect_foreign_accesses(val)
-                elif isinstance(val, (list, tuple)):
-                    for item in val:
-                        if isinstance(item, node.Node):
-                            collect_foreign_accesses(item)
-
-    # Iterate through statements in the method body
-    if hasattr(method_node.body, 'sequence') and method_node.body.sequence is not None:
-        for stmt in method_node.body.sequence:
-            if hasattr(stmt, 'statement'):
-                collect_foreign_accesses(stmt.statement)
-    
-    return len(foreign_accesses)
-
-def count_fanout_method(method_body: str, class_methods=None) -> int:
+def count_fanout_method(method_node, class_methods=None) -> int:
     """
     Refined FANOUT_method metric:
     Count unique external class or method calls from a method body.
 
     Args:
-        method_body (str): Method code as string.
+        method_node: FunctionDeclaration dari parser kopyt.
         class_methods (set): Optional, names of own class methods to exclude from count.
 
     Returns:
         int: Number of unique external class or method calls.
     """
-    if not method_body:
-        return 0
-
-    external_calls = set()
-    class_methods = class_methods or set()
-
-    lines = method_body.split('\n')
-
-    for line in lines:
-        line = line.strip()
-
-        if not line or line.startswith('//') or line.startswith('/*'):
-            continue
-
-        # Case 1: object.method() or safe-call obj?.method()
-        if '.' in line and '(' in line:
-            segments = line.replace('?.', '.').split('.')
-            for i in range(len(segments) - 1):
-                receiver = segments[i].strip().split(' ')[-1]
-                method_part = segments[i + 1].split('(')[0].strip()
-
-                if receiver not in ('this', 'super', ''):
-                    external_calls.add(f"{receiver}.{method_part}")
-
-        # Case 2: direct method calls (no dot)
-        elif '(' in line:
-            candidate = line.split('(')[0].strip()
-            if candidate and candidate not in class_methods:
-                external_calls.add(candidate)
-
-    return len(external_calls)
+    return len(_method_info(method_node, class_methods=class_methods or ()).external_calls)
 
 def count_atld_method(method_node, class_fields):
-    attributes_accessed = set()
-    local_variables = set()
-
-    # Step 1: parameters as locals
-    if hasattr(method_node, 'parameters'):
-        for param in method_node.parameters:
-            if hasattr(param, 'name'):
-                local_variables.add(param.name)
-
-    # Step 2: fallback to body text scan
-    body_text = str(method_node.body) if method_node.body else ""
-
-    # Detect class attributes used
-    for field in class_fields:
-        if field in body_text:
-            attributes_accessed.add(field)
-
-    # Detect locals by looking for `val` / `var` declarations
-    for line in body_text.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("val ") or stripped.startswith("var "):
-            parts = stripped.split()
-            if len(parts) >= 2:
-                var_name = parts[1].split("=")[0].strip()
-                if var_name.isidentifier():
-                    local_variables.add(var_name)
-
-    # Final calculation
-    local_count = len(local_variables)
-    attr_count = len(attributes_accessed)
+    return _method_info(method_node, class_fields=class_fields).atld
 
-    return round(attr_count / local_count, 2) if local_count > 0 else float(attr_count)
-
-def count_cfnamm_method(class_declaration):
+def count_cfnamm_method(class_declaration, class_info=None):
     """
     Menghitung CFNAMM_method per method: 
     berapa banyak metode non-AM lain yang dipanggil oleh masing-masing method.
     """
-    if not hasattr(class_declaration, 'body') or class_declaration.body is None:
+    class_info = class_info or ClassInfo(class_declaration)
+    if not class_info.has_body:
         return {}
 
+    # Ambil method non-AM
     methods = {}
-    class_properties = set()
-
-    # 1. Kumpulkan semua properti
-    for member in class_declaration.body.members:
-        if isinstance(member, node.PropertyDeclaration):
-            decl = member.declaration
-            if isinstance(decl, node.VariableDeclaration):
-                class_properties.add(decl.name)
-            elif isinstance(decl, node.MultiVariableDeclaration):
-                for var in decl.sequence:
-                    class_properties.add(var.name)
-
-    # 2. Ambil method non-AM
-    for member in class_declaration.body.members:
-        if isinstance(member, node.FunctionDeclaration):
-            function_name = member.name
-            if function_name == class_declaration.name:
-                continue
-
-            body_str = str(member.body) if member.body else ""
-            clean_body = body_str.replace('\n', '').strip()
-
-            is_accessor = (
-                function_name.startswith("get") or function_name.startswith("is")
-            ) and any(prop in clean_body for prop in class_properties)
-
-            is_mutator = (
-                function_name.startswith("set") and any(f"{prop} =" in clean_body for prop in class_properties)
-            )
-
-            if not (is_accessor or is_mutator):
-                methods[function_name] = body_str
+    for method in class_info.methods:
+        if method.name == class_info.name:
+            continue
+        if not method.is_accessor_mutator:
+            methods[method.name] = method.own_calls
 
     if not methods:
         return {}
@@ -279,12 +339,9 @@ def count_cfnamm_method(class_declaration):
     method_names = set(methods.keys())
     cfnamm_per_method = {}
 
-    # 3. Untuk tiap method, hitung coupling terhadap method lain
-    for method_name, body_str in methods.items():
-        calls = 0
-        for other in method_names:
-            if other != method_name and f"{other}(" in body_str:
-                calls += 1
+    # Untuk tiap method, hitung coupling terhadap method lain
+    for method_name, own_calls in methods.items():
+        calls = len((own_calls & method_names) - {method_name})
         max_possible = len(method_names) - 1
         ratio = round(calls / max_possible, 2) if max_possible > 0 else 0.0
         cfnamm_per_method[method_name] = ratio
@@ -326,37 +383,26 @@ PREDEFINED_DIT_MAP = {
     "Thread": 1,
 }
 
+def external_dit(parent_name) -> int:
+    """DIT yang didapat dari satu supertype di luar proyek (framework/library)."""
+    # Cek di kamus; jika tidak ada di kamus, anggap DIT-nya 1
+    return 1 + PREDEFINED_DIT_MAP.get(parent_name, 0)
+
 def count_dit_by_name(class_declaration) -> int:
     """
     Memperkirakan DIT berdasarkan nama superclass menggunakan kamus yang telah ditentukan.
+    Hanya melihat satu kelas; DIT yang memperhitungkan kelas lain di proyek
+    dihitung oleh resolve_file_results lewat ClassHierarchy.
     """
     if not hasattr(class_declaration, 'supertypes') or not class_declaration.supertypes:
         return 0
 
     max_depth = 0
     
-    for supertype_node in class_declaration.supertypes:
-        parent_name = None
-        delegate = getattr(supertype_node, 'delegate', None)
-        
-        if isinstance(delegate, node.ConstructorInvocation):
-            parent_name = str(delegate.invoker)
-        elif isinstance(delegate, node.UserType):
-            parent_name = str(delegate)
-
-        if parent_name:
-            # Hapus generic types jika ada (e.g., "Adapter<MyViewHolder>" -> "Adapter")
-            clean_parent_name = parent_name.split('<')[0]
-            
-            # Cek di kamus
-            if clean_parent_name in PREDEFINED_DIT_MAP:
-                depth = 1 + PREDEFINED_DIT_MAP[clean_parent_name]
-            else:
-                # Jika tidak ada di kamus, anggap DIT-nya 1
-                depth = 1
-            
-            if depth > max_depth:
-                max_depth = depth
+    for parent_name in supertype_names(class_declaration):
+        depth = external_dit(parent_name)
+        if depth > max_depth:
+            max_depth = depth
 
     # Jika tidak ada superclass yang dikenali, tapi ada supertypes, default ke 1
     if max_depth == 0 and class_declaration.supertypes:
@@ -364,58 +410,69 @@ def count_dit_by_name(class_declaration) -> int:
         
     return max_depth
 
-def count_fanout_type(class_declaration, fanout_method_values):
+def extracted_method(file_path, data=None, budget=None):
     """
-    Menghitung FANOUT_type dengan menjumlahkan semua FANOUT_method dalam sebuah kelas.
-    
+    Ekstrak informasi metode dan metrik dari satu file Kotlin.
+    Fungsi ini lengkap dan menangani berbagai kasus.
+
+    DIT_type dan NIM_type hanya memperhitungkan kelas di file ini sendiri;
+    untuk nilai tingkat proyek gunakan extract_files/extract_and_parse.
+
     Args:
-        class_declaration: Deklarasi kelas dari parser kopyt
-        fanout_method_values: Dictionary yang berisi nilai FANOUT_method per method
-        
-    Returns:
-        int: Total FANOUT_type (sum of all FANOUT_method in the class)
+        file_path (str): Path file (dipakai juga sebagai nama pada baris error).
+        data (bytes): Optional, isi file yang sudah dibaca, misalnya langsung dari arsip.
+        budget (ParseBudget): Optional, batas waktu/memori (program/guard.py). Jika
+            diisi, file diproses di proses worker terpisah dan file yang melewati
+            batas menghasilkan satu baris dengan kolom Error terisi.
     """
-    if not hasattr(class_declaration, 'body') or class_declaration.body is None:
-        return 0
-        
-    # Jika class_declaration adalah kelas yang valid, jumlahkan semua FANOUT_method-nya
-    total_fanout = 0
-    for member in class_declaration.body.members:
-        if isinstance(member, node.FunctionDeclaration):
-            method_name = member.name
-            total_fanout += fanout_method_values.get(method_name, 0)
-    
-    return total_fanout
-
-def extracted_method(file_path):
+    if budget is not None and budget.enabled():
+        item = KotlinSource(file_path, data) if data is not None else file_path
+        [(_, result)] = _iter_guarded([item], [0], 1, budget)
+    else:
+        result = extract_file(file_path, data)
+    return record_rows(resolve_file_results([result])[0], result["methods"])
+
+def extract_file(file_path, data=None):
     """
-    Ekstrak informasi metode dan metrik dari satu file Kotlin.
-    Fungsi ini lengkap dan menangani berbagai kasus.
+    Seperti extracted_method, tetapi DIT_type dan NIM_type belum di-resolve terhadap proyek.
+
+    Returns:
+        dict: "classes" berisi tabel kelas file ini (ClassRecord, satu per
+        deklarasi kelas top-level sesuai urutannya), "methods" baris method-nya
+        (MethodRecord, dengan indeks kelas di "classes") dan "types" fakta
+        hierarki kelasnya (lihat hierarchy.file_facts), atau None jika file gagal
+        di-parse. Ketiganya JSON-serializable untuk cache dan manifest (record
+        menjadi list dengan urutan yang sama); lihat record_rows untuk baris dict.
+        "timings" berisi waktu per tahap/metrik (lihat profiling.StageTimer) dan
+        "seconds" total waktu file ini; keduanya dibuang sebelum hasil disimpan.
     """
-    results_for_file = []
+    classes = []
+    methods = []
+    types = None
+    timer = StageTimer()
+    start = time.perf_counter()
     
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+        if data is None:
+            with timer.stage("read"):
+                with open(file_path, "rb") as f:
+                    data = f.read()
+        with timer.stage("decode"):
+            code = decode_source(data)
         
-        parser = Parser(code)
-        ast = parser.parse()
+        with timer.stage("parse"):
+            parser = Parser(code)
+            ast = parser.parse()
 
         package_name = ast.package.name if ast.package else "Unknown"
+        with timer.stage("hierarchy_facts"):
+            types = file_facts(ast)
 
         # Kasus 1: File tidak memiliki deklarasi kelas sama sekali
         if not ast.declarations:
-            results_for_file.append({
-                "Package": package_name, 
-                "Class": "No Class Found", 
-                "Method": "None", 
-                "LOC": len(code.splitlines()), 
-                "NOMNAMM_type": 0, "NOA_type": 0, "NIM_type": 0,
-                "ATFD_type": 0, "DIT_type": 0, "FANOUT_type": 0,
-                "FANOUT_method": 0, "ATLD_method": 0.0, "CFNAMM_method": 0.0,
-                "Error": "No class declarations in file"
-            })
-            return results_for_file
+            classes.append(ClassRecord(package_name, "No Class Found", 0, 0, 0, 0, 0, 0))
+            methods.append(MethodRecord(0, "None", len(code.splitlines()), 0, 0.0, 0.0, "No class declarations in file"))
+            return _file_result(classes, methods, types, timer, start)
 
         # Iterasi melalui semua deklarasi di file
         for class_declaration in ast.declarations:
@@ -424,9 +481,12 @@ def extracted_method(file_path):
                 continue
 
             class_name = class_declaration.name
+            # Posisi kelas di tabel kelas file ini, sama dengan posisinya di types["classes"]
+            class_index = len(classes)
             
             # --- Perhitungan Metrik Tingkat Kelas ---
-            dit_total = count_dit_by_name(class_declaration)
+            with timer.stage("count_dit_by_name"):
+                dit_total = count_dit_by_name(class_declaration)
             
             # Default values
             nomnamm_total = 0
@@ -435,134 +495,560 @@ def extracted_method(file_path):
             cfnamm_results = {}
             fanout_method_values = {}
             atfd_method_values = {}
-            class_fields = set()
 
             # Kasus 2: Kelas tidak punya body
             if not hasattr(class_declaration, 'body') or class_declaration.body is None:
-                results_for_file.append({
-                    "Package": package_name, "Class": class_name, "Method": "None", "LOC": 0,
-                    "NOMNAMM_type": 0, "NOA_type": 0, "NIM_type": 0,
-                    "ATFD_type": 0, "DIT_type": dit_total, "FANOUT_type": 0,
-                    "FANOUT_method": 0, "ATLD_method": 0.0, "CFNAMM_method": 0.0,
-                    "Error": "Class has no body"
-                })
+                classes.append(ClassRecord(package_name, class_name, 0, 0, 0, 0, dit_total, 0))
+                methods.append(MethodRecord(class_index, "None", 0, 0, 0.0, 0.0, "Class has no body"))
                 continue
 
-            # Hitung metrik jika kelas punya body
-            nomnamm_total = count_nomnamm_type(class_declaration)
-            noa_total = count_noa_type(class_declaration)
-            nim_total = count_nim_type(class_declaration)
-            cfnamm_results = count_cfnamm_method(class_declaration)
-
-            # Kumpulkan properti kelas untuk perhitungan ATLD
-            for member in class_declaration.body.members:
-                if isinstance(member, node.PropertyDeclaration):
-                    decl = member.declaration
-                    if isinstance(decl, node.VariableDeclaration):
-                        class_fields.add(decl.name)
-                    elif isinstance(decl, node.MultiVariableDeclaration):
-                        for var in decl.sequence:
-                            class_fields.add(var.name)
+            # Hitung metrik jika kelas punya body, semuanya dari model kelas yang sama.
+            # ClassInfo juga menjalankan satu penelusuran AST per method untuk ATFD,
+            # FANOUT_method, ATLD_method dan pemanggilan method sendiri (CFNAMM), jadi
+            # keempat metrik itu tercatat bersama di tahap "class_model_method_walk"
+            with timer.stage("class_model_method_walk"):
+                class_info = ClassInfo(class_declaration)
+            with timer.stage("count_nomnamm_type"):
+                nomnamm_total = count_nomnamm_type(class_declaration, class_info)
+            with timer.stage("count_noa_type"):
+                noa_total = count_noa_type(class_declaration, class_info)
+            with timer.stage("count_nim_type"):
+                nim_total = count_nim_type(class_declaration, class_info)
+            with timer.stage("cfnamm_ratio"):
+                cfnamm_results = count_cfnamm_method(class_declaration, class_info)
 
             # --- Perhitungan Metrik Tingkat Method ---
-            method_found_in_class = False
-            for member in class_declaration.body.members:
-                if isinstance(member, node.FunctionDeclaration):
-                    method_found_in_class = True
-                    function_name = member.name
-                    body_str = str(member.body) if member.body else ""
-                    
-                    loc_count = body_str.count('\n') + 1 if body_str else 0
-                    fanout_value = count_fanout_method(body_str, {m.name for m in class_declaration.body.members if isinstance(m, node.FunctionDeclaration)})
-                    atld_value = count_atld_method(member, class_fields)
-                    cfnamm_value = cfnamm_results.get(function_name, 0.0)
-                    atfd_value = count_atfd(member, class_declaration)
-                    
-                    fanout_method_values[function_name] = fanout_value
-                    atfd_method_values[function_name] = atfd_value
-
-                    results_for_file.append({
-                        "Package": package_name,
-                        "Class": class_name,
-                        "Method": function_name,
-                        "LOC": loc_count,
-                        "NOMNAMM_type": nomnamm_total,
-                        "NOA_type": noa_total,
-                        "NIM_type": nim_total,
-                        "ATFD_type": 0,  # Placeholder
-                        "DIT_type": dit_total,
-                        "FANOUT_type": 0,  # Placeholder
-                        "FANOUT_method": fanout_value,
-                        "ATLD_method": atld_value,
-                        "CFNAMM_method": cfnamm_value,
-                        "Error": ""
-                    })
+            # Baris method hanya menyimpan indeks kelasnya; nilai tingkat kelas ada
+            # sekali di tabel kelas, jadi tidak tertukar antar kelas yang namanya sama.
+            class_methods = []
+            for method in class_info.methods:
+                function_name = method.name
+                body_str = method.body_text
+                
+                loc_count = body_str.count('\n') + 1 if body_str else 0
+                fanout_value = len(method.external_calls)
+                atld_value = method.atld
+                cfnamm_value = cfnamm_results.get(function_name, 0.0)
+                atfd_value = len(method.foreign_accesses)
+                
+                fanout_method_values[function_name] = fanout_value
+                atfd_method_values[function_name] = atfd_value
+
+                class_methods.append(
+                    MethodRecord(class_index, function_name, loc_count, fanout_value, atld_value, cfnamm_value, "")
+                )
 
             # --- Finalisasi Metrik Tingkat Kelas ---
             fanout_type_total = sum(fanout_method_values.values())
             atfd_type_total = sum(atfd_method_values.values())
 
+            classes.append(ClassRecord(
+                package_name, class_name, nomnamm_total, noa_total, nim_total,
+                atfd_type_total, dit_total, fanout_type_total,
+            ))
             # Kasus 3: Kelas punya body tapi tidak punya method
-            if not method_found_in_class:
+            if not class_methods:
                 class_loc = len(str(class_declaration.body).splitlines()) if class_declaration.body else 0
-                results_for_file.append({
-                    "Package": package_name, "Class": class_name, "Method": "None", "LOC": class_loc,
-                    "NOMNAMM_type": nomnamm_total, "NOA_type": noa_total, "NIM_type": nim_total,
-                    "ATFD_type": atfd_type_total, "DIT_type": dit_total, "FANOUT_type": fanout_type_total,
-                    "FANOUT_method": 0, "ATLD_method": 0.0, "CFNAMM_method": 0.0,
-                    "Error": "No methods found in class"
-                })
+                methods.append(MethodRecord(class_index, "None", class_loc, 0, 0.0, 0.0, "No methods found in class"))
             else:
-                # Update placeholder ATFD_type dan FANOUT_type di setiap baris
-                for row in results_for_file:
-                    if row["Class"] == class_name:
-                        row["FANOUT_type"] = fanout_type_total
-                        row["ATFD_type"] = atfd_type_total
+                methods.extend(class_methods)
 
+    except MemoryError:
+        # Batas memori worker (ParseBudget) terlampaui; AST yang setengah jadi sudah dilepas
+        classes, methods = [], []
+        _append_file_error(classes, methods, file_path, MEMORY_LIMIT_ERROR)
+        types = None
     except Exception as e:
         # Menangani error fatal saat parsing file
-        results_for_file.append({
-            "Package": "Error", "Class": os.path.basename(file_path), "Method": "Error", "LOC": 0,
-            "NOMNAMM_type": 0, "NOA_type": 0, "NIM_type": 0,
-            "ATFD_type": 0, "DIT_type": 0, "FANOUT_type": 0,
-            "FANOUT_method": 0, "ATLD_method": 0.0, "CFNAMM_method": 0.0,
-            "Error": f"Fatal parsing error: {str(e)}"
-        })
-
-    return results_for_file
-
-def extract_and_parse(file):
-    """Ekstrak arsip ZIP/RAR dan proses file Kotlin."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_file_path = os.path.join(temp_dir, file.name)
-        with open(temp_file_path, "wb") as f:
-            f.write(file.getbuffer())
-        
-        try:
-            patoolib.extract_archive(temp_file_path, outdir=temp_dir)
-            kotlin_files = [os.path.join(root, f) for root, _, files in os.walk(temp_dir) for f in files if f.endswith(".kt") or f.endswith(".kts")]
-            
-            results = []
-            for kotlin_file in kotlin_files:
-                results.extend(extracted_method(kotlin_file))
-            
-            return pd.DataFrame(results)
-        except Exception as e:
-            # Jika ekstraksi arsip gagal atau tidak ada file Kotlin yang ditemukan
-            return pd.DataFrame([{
-                "Package": "Error",
-                "Class": "Error",
-                "Method": "Error",
-                "LOC": 0,
-                "NOMNAMM_type": 0,
-                "NOA_type": 0,
-                "NIM_type": 0,
-                "ATFD_type": 0,
-                "DIT_type": 0,
-                "FANOUT_type": 0,
-                "FANOUT_method": 0,
-                "ATLD_method": 0,
-                "CFNAMM_method": 0.0,
-                "ATFD_method": 0,
-                "Error": f"Archive extraction or file search failed: {str(e)}"
-            }])
\ No newline at end of file
+        _append_file_error(classes, methods, file_path, f"Fatal parsing error: {str(e)}")
+        types = None
+
+    return _file_result(classes, methods, types, timer, start)
+
+def _file_result(classes, methods, types, timer, start):
+    return {
+        "classes": classes, "methods": methods, "types": types,
+        "timings": timer.timings, "seconds": time.perf_counter() - start,
+    }
+
+def record_rows(classes, methods):
+    """
+    Baris dict (kolom RESULT_COLUMNS, urutan yang sama) dari tabel kelas dan
+    record method satu file hasil extract_file.
+    """
+    class_values = [dict(zip(CLASS_COLUMNS, record)) for record in classes]
+    rows = []
+    for record in methods:
+        values = dict(zip(METHOD_COLUMNS, record[1:]), **class_values[record[0]])
+        rows.append({name: values[name] for name, _ in RESULT_COLUMNS})
+    return rows
+
+def _resolved_classes(hierarchy, result):
+    """Tabel kelas `result` dengan DIT_type dan NIM_type dari indeks proyek."""
+    types = result["types"]
+    if not types or not types["classes"]:
+        return result["classes"]
+    # types["classes"] dan tabel kelas sama-sama satu entri per deklarasi kelas, berurutan
+    return [
+        ClassRecord(*record)._replace(DIT_type=dit, NIM_type=nim)
+        for record, (dit, nim) in zip(result["classes"], hierarchy.class_values(types))
+    ]
+
+def resolve_file_results(file_results):
+    """
+    Ganti DIT_type dan NIM_type setiap kelas dengan nilai tingkat proyek.
+
+    Semua kelas dari `file_results` (hasil extract_file) diindeks sekali dalam
+    ClassHierarchy, sehingga superclass/interface yang dideklarasikan di file
+    lain ikut dihitung; PREDEFINED_DIT_MAP hanya dipakai untuk tipe di luar proyek.
+
+    Returns:
+        list: Satu tabel kelas (ClassRecord) untuk setiap hasil, dengan urutan
+        yang sama; record method-nya tetap `result["methods"]`.
+    """
+    hierarchy = ClassHierarchy.from_files(
+        (result["types"] for result in file_results), external_depth=external_dit
+    )
+    return [_resolved_classes(hierarchy, result) for result in file_results]
+
+def is_storable(result):
+    """
+    True jika hasil satu file boleh disimpan untuk run berikutnya (cache, manifest).
+
+    Baris error (timeout, batas memori, worker crash, parse gagal) bergantung pada
+    nama file dan kondisi worker saat itu, jadi file seperti itu selalu diproses ulang.
+    """
+    return not any(record[0] == "Error" for record in result["classes"])
+
+def _error_result(file_path, message):
+    classes, methods = [], []
+    _append_file_error(classes, methods, file_path, message)
+    return {"classes": classes, "methods": methods, "types": None}
+
+def _append_file_error(classes, methods, file_path, message):
+    """Tambahkan kelas dan baris hasil untuk file yang gagal diproses secara keseluruhan."""
+    methods.append(MethodRecord(len(classes), "Error", 0, 0, 0.0, 0.0, message))
+    classes.append(ClassRecord("Error", os.path.basename(file_path), 0, 0, 0, 0, 0, 0))
+
+def _source_path(item):
+    return item.path if isinstance(item, (KotlinSource, SourceRef)) else item
+
+def _load_item(item):
+    """Baca isi SourceRef tepat sebelum dikirim ke worker; item lain dikirim apa adanya."""
+    return item.load() if isinstance(item, SourceRef) else item
+
+def _extract_item(item):
+    """Proses satu item: path file atau KotlinSource yang isinya sudah di memori."""
+    if isinstance(item, KotlinSource):
+        return extract_file(item.path, item.data)
+    return extract_file(item)
+
+def _run_pool(kotlin_files, indices, workers, unfinished):
+    """
+    Jalankan extract_file untuk file pada `indices` di process pool.
+
+    Paling banyak POOL_QUEUE_PER_WORKER file per worker yang dikirim sekaligus
+    (sesuai urutan `indices`), jadi isi SourceRef dibaca saat file itu dikirim,
+    bukan semuanya di awal.
+
+    Yields:
+        tuple: (indeks, hasil extract_file) sesuai urutan selesai. Indeks file
+        yang belum selesai karena worker mati ditambahkan ke `unfinished`.
+    """
+    remaining = iter(indices)
+    futures = {}
+    broken = False
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def submit_next():
+            """Kirim file berikutnya (jika ada); False jika pool sudah mati."""
+            i = next(remaining, None)
+            if i is None:
+                return True
+            try:
+                futures[executor.submit(_extract_item, _load_item(kotlin_files[i]))] = i
+            except BrokenProcessPool:
+                unfinished.append(i)
+                return False
+            return True
+
+        for _ in range(POOL_QUEUE_PER_WORKER * workers):
+            submit_next()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = futures.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    unfinished.append(i)
+                    continue
+                except Exception as e:
+                    result = _error_result(_source_path(kotlin_files[i]), f"Worker error: {str(e)}")
+                if not broken:
+                    broken = not submit_next()
+                yield i, result
+    # File yang belum sempat dikirim saat pool mati
+    unfinished.extend(remaining)
+
+def _iter_guarded(kotlin_files, pending, workers, budget):
+    """
+    Seperti _iter_pending, tetapi setiap file dibatasi `budget`.
+
+    File yang melewati batas waktu ditinggalkan (workernya dimatikan dan
+    diganti), jadi durasi total ditentukan file pada umumnya, bukan file
+    terburuk. Worker lain tetap berjalan selama itu.
+    """
+    statuses = run_guarded(_extract_item, [kotlin_files[i] for i in pending], workers, budget, load=_load_item)
+    for position, status, value in statuses:
+        i = pending[position]
+        path = _source_path(kotlin_files[i])
+        if status == "ok":
+            result = value
+        elif status == "timeout":
+            result = _error_result(path, f"Parse timeout: exceeded {budget.seconds:g}s per-file budget")
+            result["seconds"] = budget.seconds
+        elif status == "memory":
+            result = _error_result(path, MEMORY_LIMIT_ERROR)
+        elif status == "crashed":
+            result = _error_result(path, "Worker process crashed while parsing file")
+        else:
+            result = _error_result(path, f"Worker error: {value}")
+        yield i, result
+
+def _iter_pending(kotlin_files, pending, workers, budget=None):
+    """
+    Jalankan extract_file untuk setiap indeks di `pending`, paralel bila workers > 1.
+
+    Yields:
+        tuple: (indeks, hasil extract_file) sesuai urutan selesai.
+    """
+    if not pending:
+        return
+    if budget is not None and budget.enabled():
+        yield from _iter_guarded(kotlin_files, pending, workers, budget)
+        return
+
+    workers = min(workers, len(pending))
+
+    if workers <= 1:
+        for i in pending:
+            yield i, _extract_item(_load_item(kotlin_files[i]))
+        return
+
+    unfinished = []
+    yield from _run_pool(kotlin_files, pending, workers, unfinished)
+
+    # Worker yang crash mematikan seluruh pool, jadi sebagian besar file yang
+    # tertunda hanya ikut gagal. Semuanya dicoba lagi di pool baru selebar semula;
+    # hanya file yang tertunda lagi yang dijalankan satu per satu di pool terpisah
+    # agar file penyebabnya terisolasi.
+    if unfinished:
+        unfinished = set(unfinished)
+        retry = [i for i in pending if i in unfinished]
+        # _run_pool mengirim file sesuai urutan dan paling banyak POOL_QUEUE_PER_WORKER
+        # per worker sekaligus, jadi penyebab crash ada di awal `retry`. File-file itu
+        # dijalankan paling akhir supaya sisanya selesai lebih dulu.
+        in_flight = POOL_QUEUE_PER_WORKER * workers
+        retry = retry[in_flight:] + retry[:in_flight]
+        unfinished = []
+        yield from _run_pool(kotlin_files, retry, min(workers, len(retry)), unfinished)
+
+    for i in sorted(unfinished):
+        crashed = []
+        yield from _run_pool(kotlin_files, [i], 1, crashed)
+        if crashed:
+            yield i, _error_result(_source_path(kotlin_files[i]), "Worker process crashed while parsing file")
+
+def extract_files(kotlin_files, workers=None, cache=None, stats=None, budget=None, progress=None):
+    """
+    Jalankan extracted_method untuk banyak file, paralel di process pool.
+    DIT_type di-resolve terhadap semua kelas di `kotlin_files`.
+
+    Args:
+        kotlin_files (list): Path file Kotlin, KotlinSource (isi file di memori) atau
+            SourceRef (isi dibaca dari arsip saat file itu dikirim ke worker).
+        workers (int): Jumlah proses worker. None berarti jumlah core CPU,
+            1 berarti diproses berurutan di proses ini.
+        cache (ResultCache): Optional, cache hasil per file (program/cache.py).
+            File yang isinya sudah ada di cache tidak di-parse ulang.
+        stats (PipelineStats): Optional, diisi waktu per tahap dan file paling lambat.
+        budget (ParseBudget): Optional, batas waktu/memori per file (program/guard.py).
+            Jika diisi, semua file diproses di worker yang diawasi (juga saat
+            workers=1) dan file yang melewati batas ditandai di kolom Error.
+        progress (callable): Optional, dipanggil `progress(done, total, path, rows)`
+            setiap kali satu file selesai (termasuk yang diambil dari cache).
+            `rows` adalah baris file itu sebelum DIT_type/NIM_type di-resolve
+            terhadap proyek, jadi cocok untuk hasil sementara di UI.
+
+    Returns:
+        list: Baris hasil semua file, urutannya sama dengan `kotlin_files`.
+    """
+    per_file = extract_files_grouped(
+        kotlin_files, workers=workers, cache=cache, stats=stats, budget=budget, progress=progress
+    )
+    return [row for rows in per_file for row in rows]
+
+def extract_columns(kotlin_files, workers=None, cache=None, stats=None, budget=None, progress=None):
+    """
+    Sama seperti extract_files, tetapi hasilnya dikumpulkan langsung ke kolom bertipe.
+
+    Record kelas dan method setiap file dipindahkan ke ResultColumns begitu file
+    itu selesai lalu dilepas, tanpa dict per baris dan tanpa list berisi semua
+    baris sekaligus; yang disimpan per file hanya posisi barisnya, id kelasnya
+    dan fakta hierarkinya. Setelah semua file selesai, DIT_type/NIM_type diganti
+    sekali per kelas di tabel kelas (ResultColumns.update_group) dan baris
+    disusun ulang sesuai urutan file. Panggil `.to_frame()`, `.to_frames()` atau
+    `.to_arrow()` pada hasilnya.
+
+    Returns:
+        ResultColumns: Baris semua file, urutannya sama dengan `kotlin_files`.
+    """
+    total = len(kotlin_files)
+    columns = ResultColumns()
+    # indeks file -> (baris pertama, jumlah baris, id kelas di `columns`, fakta hierarki)
+    spans = [None] * total
+    with stage(stats, "extract_files"):
+        results = iter_file_results(kotlin_files, workers=workers, cache=cache, stats=stats, budget=budget)
+        for done, (i, result) in enumerate(results, start=1):
+            if progress is not None:
+                rows = record_rows(result["classes"], result["methods"])
+                progress(done, total, _source_path(kotlin_files[i]), rows)
+            start = len(columns)
+            class_ids = columns.extend_records(result["classes"], result["methods"])
+            spans[i] = (start, len(columns) - start, class_ids, result["types"])
+
+    with stage(stats, "resolve_hierarchy"):
+        hierarchy = ClassHierarchy.from_files((span[3] for span in spans), external_depth=external_dit)
+        for _, _, class_ids, types in spans:
+            if not types or not types["classes"]:
+                continue
+            # types["classes"] sejajar dengan tabel kelas file ini (lihat extract_file)
+            for class_id, (dit, nim) in zip(class_ids, hierarchy.class_values(types)):
+                columns.update_group(class_id, {"DIT_type": dit, "NIM_type": nim})
+
+    with stage(stats, "columns"):
+        # Baris ditambahkan sesuai urutan selesai; susun ulang hanya jika berbeda dari urutan file
+        if any(spans[k][0] > spans[k + 1][0] for k in range(total - 1)):
+            order = array("q")
+            for start, count, _, _ in spans:
+                order.extend(range(start, start + count))
+            columns.reorder(order)
+    return columns
+
+def extract_files_grouped(kotlin_files, workers=None, cache=None, stats=None, budget=None, progress=None):
+    """
+    Sama seperti extract_files, tetapi baris hasil dikelompokkan per file.
+
+    Returns:
+        list: Satu list baris untuk setiap item di `kotlin_files`, dengan urutan yang sama.
+    """
+    file_results = extract_file_results(
+        kotlin_files, workers=workers, cache=cache, stats=stats, budget=budget, progress=progress
+    )
+    with stage(stats, "resolve_hierarchy"):
+        per_file = resolve_file_results(file_results)
+    return [record_rows(classes, result["methods"]) for classes, result in zip(per_file, file_results)]
+
+def extract_file_results(kotlin_files, workers=None, cache=None, stats=None, budget=None, progress=None):
+    """
+    Jalankan extract_file untuk banyak file (paralel, dengan cache opsional)
+    tanpa resolve DIT/NIM; hasilnya diteruskan ke resolve_file_results.
+
+    Returns:
+        list: Satu hasil extract_file untuk setiap item di `kotlin_files`.
+    """
+    per_file = [None] * len(kotlin_files)
+    with stage(stats, "extract_files"):
+        results = iter_file_results(kotlin_files, workers=workers, cache=cache, stats=stats, budget=budget)
+        for done, (i, result) in enumerate(results, start=1):
+            per_file[i] = result
+            if progress is not None:
+                rows = record_rows(result["classes"], result["methods"])
+                progress(done, len(kotlin_files), _source_path(kotlin_files[i]), rows)
+    return per_file
+
+def iter_file_results(kotlin_files, workers=None, cache=None, stats=None, budget=None):
+    """
+    Seperti extract_file_results, tetapi setiap hasil di-yield begitu file selesai.
+
+    File yang ada di cache di-yield lebih dulu; hasil baru langsung disimpan
+    ke cache (kecuali baris error) sebelum di-yield.
+
+    Yields:
+        tuple: (indeks di `kotlin_files`, hasil extract_file tanpa timings), sesuai urutan selesai.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = list(range(len(kotlin_files)))
+    digests = {}
+
+    if cache is not None:
+        from .cache import content_digest
+
+        pending = []
+        for i, kotlin_file in enumerate(kotlin_files):
+            lookup_start = time.perf_counter()
+            if isinstance(kotlin_file, KotlinSource):
+                digests[i] = content_digest(kotlin_file.data)
+            elif isinstance(kotlin_file, SourceRef):
+                # Isi hanya dibaca untuk hash; file yang tidak ada di cache dibaca lagi saat dikirim ke worker
+                digests[i] = content_digest(kotlin_file.read())
+            else:
+                try:
+                    with open(kotlin_file, "rb") as f:
+                        digests[i] = content_digest(f.read())
+                except OSError:
+                    # Biarkan extracted_method yang melaporkan error-nya
+                    pending.append(i)
+                    continue
+
+            cached_result = cache.get(digests[i])
+            if stats is not None:
+                stats.add("cache_lookup", time.perf_counter() - lookup_start)
+            if cached_result is None:
+                pending.append(i)
+            else:
+                yield i, cached_result
+        # Waktu pakai semua hit run ini ditulis dalam satu transaksi
+        cache.flush()
+
+    for i, result in _iter_pending(kotlin_files, pending, workers, budget):
+        # Timings hanya untuk statistik run ini, tidak ikut disimpan di cache/manifest
+        timings = result.pop("timings", None)
+        seconds = result.pop("seconds", 0.0)
+        if stats is not None:
+            stats.add_file(_source_path(kotlin_files[i]), seconds, timings)
+
+        if cache is not None and i in digests and is_storable(result):
+            with stage(stats, "cache_store"):
+                cache.put(digests[i], result)
+        yield i, result
+
+class RowBatch(NamedTuple):
+    """
+    Hasil satu file dari iter_row_batches: tabel kelas (DIT_type/NIM_type sudah
+    final) dan record method-nya, plus jumlah file yang sudah di-yield dan totalnya.
+    """
+    path: str
+    classes: list
+    methods: list
+    done: int
+    total: int
+
+    @property
+    def rows(self):
+        """Baris dict file ini (lihat record_rows), misalnya untuk hasil sementara di UI."""
+        return record_rows(self.classes, self.methods)
+
+def _is_self_contained(types):
+    """True jika DIT_type/NIM_type file ini tidak bergantung pada file lain (tidak ada kelas dengan supertype)."""
+    return types is None or not any(class_facts["supertypes"] for class_facts in types["classes"])
+
+def iter_row_batches(file, workers=None, cache=None, stats=None, budget=None):
+    """
+    Versi streaming dari extract_and_parse: satu RowBatch per file Kotlin di arsip.
+
+    File yang tidak punya kelas dengan superclass/interface (atau gagal di-parse)
+    tidak bergantung pada file lain, jadi barisnya sudah final dan di-yield begitu
+    file itu selesai. Hasil file lain ditulis sementara ke disk dan di-yield
+    setelah semua file selesai, dengan DIT_type/NIM_type yang di-resolve terhadap
+    seluruh proyek. Yang tersimpan di memori per file hanya fakta hierarki
+    kelasnya, jadi konsumen yang menulis setiap batch ke disk (lihat
+    export.write_batches) memakai memori yang hampir tetap.
+
+    Nilai baris sama dengan extract_and_parse, tetapi urutan file mengikuti
+    urutan selesai. Argumen sama dengan extract_and_parse; error saat membaca
+    arsip dilempar ke pemanggil.
+
+    Yields:
+        RowBatch: (path, tabel kelas, record method, jumlah batch sejauh ini, jumlah file).
+    """
+    with open_kotlin_sources(file) as refs, tempfile.TemporaryFile() as spill:
+        with stage(stats, "ingest"):
+            # Hanya daftar member yang diurutkan; isi setiap file dibaca saat dikirim ke worker
+            sources = sorted(refs, key=lambda source: source.path)
+        total = len(sources)
+        facts = [None] * total
+        done = 0
+        deferred = 0
+        for i, result in iter_file_results(sources, workers=workers, cache=cache, stats=stats, budget=budget):
+            path = sources[i].path
+            facts[i] = result["types"]
+            if _is_self_contained(result["types"]):
+                done += 1
+                yield RowBatch(path, resolve_file_results([result])[0], result["methods"], done, total)
+            else:
+                pickle.dump((path, result), spill)
+                deferred += 1
+
+        with stage(stats, "resolve_hierarchy"):
+            hierarchy = ClassHierarchy.from_files(facts, external_depth=external_dit)
+        spill.seek(0)
+        for _ in range(deferred):
+            path, result = pickle.load(spill)
+            done += 1
+            yield RowBatch(path, _resolved_classes(hierarchy, result), result["methods"], done, total)
+
+
+def archive_error_frame(error):
+    """DataFrame satu baris yang dikembalikan extract_and_parse saat arsip gagal dibaca."""
+    return pd.DataFrame([{
+        "Package": "Error",
+        "Class": "Error",
+        "Method": "Error",
+        "LOC": 0,
+        "NOMNAMM_type": 0,
+        "NOA_type": 0,
+        "NIM_type": 0,
+        "ATFD_type": 0,
+        "DIT_type": 0,
+        "FANOUT_type": 0,
+        "FANOUT_method": 0,
+        "ATLD_method": 0,
+        "CFNAMM_method": 0.0,
+        "ATFD_method": 0,
+        "Error": f"Archive extraction or file search failed: {str(error)}"
+    }])
+
+
+def extract_archive_columns(file, workers=None, cache=None, stats=None, budget=None, progress=None):
+    """
+    Seperti extract_and_parse, tetapi hasilnya ResultColumns (lihat extract_columns),
+    misalnya untuk tabel method dan tabel kelas terpisah lewat `.to_frames()`.
+    Error saat membaca arsip dilempar ke pemanggil.
+    """
+    with open_kotlin_sources(file) as refs:
+        with stage(stats, "ingest"):
+            # Hanya daftar member yang diurutkan; isi setiap file dibaca saat dikirim ke worker
+            sources = sorted(refs, key=lambda source: source.path)
+        return extract_columns(
+            sources, workers=workers, cache=cache, stats=stats, budget=budget, progress=progress
+        )
+
+
+def extract_and_parse(file, workers=None, cache=None, stats=None, budget=None, progress=None):
+    """
+    Baca file Kotlin dari arsip ZIP/RAR dan proses semuanya.
+
+    Member .kt/.kts dibaca langsung dari arsip di memori (lihat program/ingest.py),
+    tanpa mengekstrak arsip ke disk; direktori build/cache dilewati.
+
+    Args:
+        file: Arsip hasil upload (file-like), bytes, atau path arsip/direktori.
+        workers (int): Jumlah proses parser paralel, default jumlah core CPU.
+        cache (ResultCache): Optional, cache hasil per file berdasarkan hash isinya.
+        stats (PipelineStats): Optional, diisi waktu per tahap (baca arsip, parse,
+            setiap metrik, resolve hierarki, DataFrame) dan file paling lambat.
+        budget (ParseBudget): Optional, batas waktu/memori per file (lihat extract_files).
+        progress (callable): Optional, progress per file (lihat extract_files).
+    """
+    try:
+        columns = extract_archive_columns(
+            file, workers=workers, cache=cache, stats=stats, budget=budget, progress=progress
+        )
+        with stage(stats, "dataframe"):
+            return columns.to_frame()
+    except Exception as e:
+        # Jika pembacaan arsip gagal atau tidak ada file Kotlin yang ditemukan
+        return archive_error_frame(e)
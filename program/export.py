@@ -0,0 +1,165 @@
+"""
+Ekspor DataFrame hasil ke CSV (bertahap), Parquet dan Arrow IPC.
+
+Dipakai halaman Download Report (bytes untuk st.download_button) dan CLI
+(tulis langsung ke file). Parquet dan Arrow IPC menyimpan tipe kolom
+(termasuk Package/Class bertipe category) dan jauh lebih cepat dibaca ulang
+dibanding CSV; CSV ditulis per potongan baris supaya tidak ada satu string
+besar berisi seluruh laporan. write_batches menulis hasil streaming
+(controller.iter_row_batches) per potongan tanpa pernah membuat DataFrame penuh.
+"""
+from io import BytesIO
+
+from .columns import ResultColumns
+
+# Nama format -> (ekstensi file, MIME type)
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "arrow": ("arrow", "application/vnd.apache.arrow.file"),
+    "jsonl": ("jsonl", "application/x-ndjson"),
+}
+
+# Kompresi default: zstd cepat dan didukung pyarrow untuk Parquet maupun Arrow IPC
+DEFAULT_COMPRESSION = "zstd"
+# Jumlah baris per potongan CSV
+CSV_CHUNK_ROWS = 50_000
+
+
+def iter_csv_chunks(df, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Yields:
+        bytes: CSV UTF-8 per potongan `chunk_rows` baris; header hanya di potongan pertama.
+    """
+    if df.empty:
+        yield df.to_csv(index=False).encode("utf-8")
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def _arrow_table(df):
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_export(df, target, output_format, compression=DEFAULT_COMPRESSION):
+    """
+    Tulis `df` ke `target` (path atau file-like biner) dalam `output_format`.
+
+    `compression` dipakai untuk Parquet dan Arrow IPC; None berarti tanpa kompresi.
+    """
+    if output_format == "csv":
+        if isinstance(target, str):
+            with open(target, "wb") as f:
+                write_export(df, f, output_format)
+            return
+        for chunk in iter_csv_chunks(df):
+            target.write(chunk)
+    elif output_format == "parquet":
+        df.to_parquet(target, index=False, compression=compression)
+    elif output_format == "arrow":
+        import pyarrow as pa
+
+        table = _arrow_table(df)
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        if isinstance(target, str):
+            with pa.OSFile(target, "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+        else:
+            # PythonFile tidak ditutup supaya buffer milik pemanggil (BytesIO) tetap bisa dibaca
+            with pa.ipc.new_file(pa.PythonFile(target, mode="w"), table.schema, options=options) as writer:
+                writer.write_table(table)
+    elif output_format == "jsonl":
+        if isinstance(target, str):
+            df.to_json(target, orient="records", lines=True)
+        else:
+            target.write(df.to_json(orient="records", lines=True).encode("utf-8"))
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+
+def export_bytes(df, output_format, compression=DEFAULT_COMPRESSION):
+    """Isi file ekspor sebagai bytes, misalnya untuk st.download_button."""
+    buffer = BytesIO()
+    write_export(df, buffer, output_format, compression)
+    return buffer.getvalue()
+
+
+class _BatchWriter:
+    """Menulis potongan pyarrow.Table berurutan ke satu file dalam `output_format`."""
+
+    def __init__(self, path, output_format, compression):
+        self.path = path
+        self.output_format = output_format
+        self.compression = compression
+        self._writer = None
+        self._sink = None
+
+    def write(self, table):
+        import pyarrow as pa
+
+        if self.output_format in ("csv", "jsonl"):
+            df = table.to_pandas()
+            with open(self.path, "ab" if self._writer else "wb") as f:
+                if self.output_format == "csv":
+                    f.write(df.to_csv(index=False, header=self._writer is None).encode("utf-8"))
+                else:
+                    f.write(df.to_json(orient="records", lines=True).encode("utf-8"))
+            self._writer = True
+        elif self.output_format == "parquet":
+            import pyarrow.parquet as pq
+
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression or "none")
+            self._writer.write_table(table)
+        elif self.output_format == "arrow":
+            # File IPC tidak mengizinkan dictionary berbeda antar batch, jadi Package/Class ditulis sebagai string
+            table = table.cast(pa.schema([
+                pa.field(field.name, pa.string() if pa.types.is_dictionary(field.type) else field.type)
+                for field in table.schema
+            ]))
+            if self._writer is None:
+                self._sink = pa.OSFile(self.path, "wb")
+                options = pa.ipc.IpcWriteOptions(compression=self.compression)
+                self._writer = pa.ipc.new_file(self._sink, table.schema, options=options)
+            self._writer.write_table(table)
+        else:
+            raise ValueError(f"Unknown output format: {self.output_format}")
+
+    def close(self):
+        if self._writer not in (None, True):
+            self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+def write_batches(batches, path, output_format, compression=DEFAULT_COMPRESSION, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Tulis RowBatch dari controller.iter_row_batches ke `path`, satu potongan per `chunk_rows` baris.
+
+    Hanya satu potongan yang ada di memori sekaligus; Parquet ditulis sebagai
+    beberapa row group, CSV/JSON Lines di-append.
+
+    Returns:
+        dict: Jumlah "files", "rows" dan "errors" (baris dengan kolom Error terisi).
+    """
+    writer = _BatchWriter(path, output_format, compression)
+    summary = {"files": 0, "rows": 0, "errors": 0}
+    columns = ResultColumns()
+    try:
+        for batch in batches:
+            summary["files"] += 1
+            summary["rows"] += len(batch.methods)
+            summary["errors"] += sum(1 for record in batch.methods if record[-1])
+            columns.extend_records(batch.classes, batch.methods)
+            if len(columns) >= chunk_rows:
+                writer.write(columns.to_arrow())
+                columns = ResultColumns()
+        if len(columns) or summary["rows"] == 0:
+            writer.write(columns.to_arrow())
+    finally:
+        writer.close()
+    return summary
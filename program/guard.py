@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import NamedTuple, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: batas memori tidak tersedia, hanya timeout
+    resource = None
+
+
+class ParseBudget(NamedTuple):
+    """Batas waktu (detik) dan memori (MB) untuk memproses satu file; None berarti tanpa batas."""
+    seconds: Optional[float] = None
+    memory_mb: Optional[int] = None
+
+    def enabled(self):
+        return bool(self.seconds or self.memory_mb)
+
+
+# Batas yang dipakai UI dan CLI: cukup longgar untuk file normal, tetapi file
+# hasil generate yang sangat besar/dalam tidak menahan seluruh ekstraksi.
+DEFAULT_BUDGET = ParseBudget(seconds=60, memory_mb=2048)
+
+
+def _limit_memory(memory_mb):
+    """Batasi address space proses ini ke ukurannya saat ini ditambah `memory_mb`."""
+    if resource is None or not memory_mb:
+        return
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        current = 0
+    limit = current + memory_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _worker(conn, function, memory_mb):
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        index, item = task
+        try:
+            conn.send((index, "ok", function(item)))
+        except MemoryError:
+            conn.send((index, "memory", None))
+        except Exception as e:
+            conn.send((index, "error", str(e)))
+
+
+class _WorkerProcess:
+    __slots__ = ("process", "conn", "task", "started")
+
+    def __init__(self, context, function, memory_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker, args=(child_conn, function, memory_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.started = 0.0
+
+    def send(self, index, item):
+        self.conn.send((index, item))
+        self.task = index
+        self.started = time.monotonic()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def run_guarded(function, items, workers, budget, load=None):
+    """
+    Jalankan `function(item)` untuk setiap item di proses worker yang diawasi.
+
+    Berbeda dengan ProcessPoolExecutor, setiap worker punya pipe sendiri,
+    sehingga worker yang melewati batas waktu bisa dimatikan tanpa mengganggu
+    file lain, lalu diganti worker baru. Batas memori dipasang di dalam worker
+    dengan RLIMIT_AS (khusus Unix). Jika `load` diisi, yang dikirim ke worker
+    adalah `load(item)`, dipanggil tepat saat worker itu siap menerima item.
+
+    Yields:
+        tuple: (indeks item, status, nilai) dengan status "ok" (nilai = hasil),
+        "timeout", "memory", "crashed" (worker mati) atau "error" (nilai = pesan).
+        Urutannya sesuai urutan selesai, bukan urutan `items`.
+    """
+    context = multiprocessing.get_context()
+    pending = deque(enumerate(items))
+    pool = [_WorkerProcess(context, function, budget.memory_mb) for _ in range(max(1, min(workers, len(items))))]
+
+    try:
+        while True:
+            for position, worker in enumerate(pool):
+                while worker.task is None and pending:
+                    index, item = pending.popleft()
+                    task = item if load is None else load(item)
+                    try:
+                        worker.send(index, task)
+                    except (OSError, ValueError):
+                        # Worker mati saat menganggur: ganti lalu kirim ulang tugasnya
+                        pending.appendleft((index, item))
+                        worker.kill()
+                        worker = pool[position] = _WorkerProcess(context, function, budget.memory_mb)
+
+            busy = [worker for worker in pool if worker.task is not None]
+            if not busy:
+                break
+
+            timeout = None
+            if budget.seconds:
+                deadline = min(worker.started for worker in busy) + budget.seconds
+                timeout = max(0.0, deadline - time.monotonic())
+
+            ready = set(wait([worker.conn for worker in busy], timeout))
+            now = time.monotonic()
+            for position, worker in enumerate(pool):
+                if worker.task is None:
+                    continue
+                if worker.conn in ready:
+                    try:
+                        index, status, value = worker.conn.recv()
+                    except (EOFError, OSError):
+                        index, status, value = worker.task, "crashed", None
+                        worker.kill()
+                        pool[position] = _WorkerProcess(context, function, budget.memory_mb)
+                    else:
+                        worker.task = None
+                    yield index, status, value
+                elif budget.seconds and now - worker.started >= budget.seconds:
+                    index = worker.task
+                    worker.kill()
+                    pool[position] = _WorkerProcess(context, function, budget.memory_mb)
+                    yield index, "timeout", None
+    finally:
+        for worker in pool:
+            worker.stop()
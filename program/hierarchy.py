@@ -0,0 +1,255 @@
+from kopyt import node
+
+
+def supertype_names(class_declaration):
+    """Nama supertype sebuah kelas seperti tertulis di source, tanpa argumen generic."""
+    names = []
+    for supertype_node in getattr(class_declaration, 'supertypes', None) or ():
+        delegate = getattr(supertype_node, 'delegate', None)
+        if isinstance(delegate, node.ConstructorInvocation):
+            parent_name = str(delegate.invoker)
+        elif isinstance(delegate, node.UserType):
+            parent_name = str(delegate)
+        else:
+            continue
+        # Hapus generic types jika ada (e.g., "Adapter<MyViewHolder>" -> "Adapter")
+        names.append(parent_name.split('<')[0].strip())
+    return names
+
+
+def _has_modifier(declaration, name):
+    return any(str(modifier).strip() == name for modifier in declaration.modifiers or ())
+
+
+def method_facts(class_declaration):
+    """Nama method yang bisa diwariskan (non-private) dan nama method override sebuah kelas."""
+    methods = set()
+    overrides = set()
+    body = getattr(class_declaration, 'body', None)
+    for member in getattr(body, 'members', None) or ():
+        if not isinstance(member, node.FunctionDeclaration):
+            continue
+        if _has_modifier(member, 'override'):
+            overrides.add(member.name)
+        if not _has_modifier(member, 'private'):
+            methods.add(member.name)
+    return sorted(methods), sorted(overrides)
+
+
+def file_facts(ast):
+    """
+    Fakta hierarki satu file yang sudah di-parse: paket, import, supertype dan
+    nama method setiap kelas/interface top-level. Hasilnya JSON-serializable
+    sehingga bisa dikirim dari worker dan disimpan di cache bersama baris hasil.
+    """
+    imports = {}
+    wildcards = []
+    for header in ast.imports or ():
+        if header.wildcard:
+            wildcards.append(header.name)
+        else:
+            imports[header.alias or header.name.rsplit('.', 1)[-1]] = header.name
+
+    classes = []
+    for declaration in ast.declarations or ():
+        if isinstance(declaration, node.ClassDeclaration):
+            methods, overrides = method_facts(declaration)
+            classes.append({
+                "name": declaration.name,
+                "supertypes": supertype_names(declaration),
+                "methods": methods,
+                "overrides": overrides,
+            })
+
+    return {
+        "package": ast.package.name if ast.package else "",
+        "imports": imports,
+        "wildcards": wildcards,
+        "classes": classes,
+    }
+
+
+class ClassHierarchy:
+    """
+    Indeks kelas seluruh proyek (nama lengkap -> supertype dan method) untuk
+    menghitung DIT dan NIM.
+
+    Supertype di-resolve seperti compiler Kotlin: paket yang sama, import
+    eksplisit, import wildcard, lalu nama lengkap. Supertype yang tidak ada di
+    proyek dianggap tipe eksternal dan kedalamannya diambil dari `external_depth`.
+    Kedalaman dan tabel method setiap kelas dihitung sekali (memo) dengan stack
+    eksplisit, jadi total kerjanya linear terhadap jumlah kelas dan rantai
+    pewarisan yang panjang tidak terkena batas rekursi Python.
+    """
+
+    def __init__(self, external_depth):
+        self.external_depth = external_depth
+        self._classes = {}  # nama lengkap -> (fakta file, fakta kelas)
+        self._parents = {}  # nama lengkap -> list nama lengkap induk / None untuk tipe eksternal
+        self._depths = {}
+        self._method_tables = {}  # nama lengkap -> frozenset method yang diwariskan ke subclass
+
+    @classmethod
+    def from_files(cls, facts_per_file, external_depth):
+        hierarchy = cls(external_depth)
+        for facts in facts_per_file:
+            hierarchy.add_file(facts)
+        return hierarchy
+
+    @staticmethod
+    def qualified_name(facts, class_name):
+        return f"{facts['package']}.{class_name}" if facts["package"] else class_name
+
+    def add_file(self, facts):
+        if not facts:
+            return
+        for class_facts in facts["classes"]:
+            # Nama lengkap yang sama di dua file: deklarasi pertama yang dipakai
+            self._classes.setdefault(self.qualified_name(facts, class_facts["name"]), (facts, class_facts))
+
+    def __len__(self):
+        return len(self._classes)
+
+    def resolve(self, facts, type_name):
+        """Nama lengkap kelas proyek yang dirujuk `type_name` dari file `facts`, atau None."""
+        head, _, rest = type_name.partition('.')
+        candidates = [self.qualified_name(facts, type_name)]
+        if head in facts["imports"]:
+            imported = facts["imports"][head]
+            candidates.append(f"{imported}.{rest}" if rest else imported)
+        candidates.extend(f"{package}.{type_name}" for package in facts["wildcards"])
+        candidates.append(type_name)
+
+        for candidate in candidates:
+            if candidate in self._classes:
+                return candidate
+        return None
+
+    def _parent_links(self, key):
+        links = self._parents.get(key)
+        if links is None:
+            facts, class_facts = self._classes[key]
+            links = [(name, self.resolve(facts, name)) for name in class_facts["supertypes"]]
+            self._parents[key] = links
+        return links
+
+    def _depth_from_links(self, links):
+        depth = 0
+        for name, parent in links:
+            if parent is None:
+                depth = max(depth, self.external_depth(name))
+            elif parent in self._depths:
+                depth = max(depth, 1 + self._depths[parent])
+            else:
+                # Pewarisan melingkar (kode tidak valid): induk dianggap akar
+                depth = max(depth, 1)
+        return depth
+
+    def _walk(self, key, memo, compute):
+        """
+        Isi `memo[key]` dengan `compute(key, links)` setelah semua induk proyeknya
+        terisi (post-order), memakai stack eksplisit alih-alih rekursi.
+        """
+        if key in memo:
+            return memo[key]
+
+        stack = [key]
+        on_path = set()
+        while stack:
+            current = stack[-1]
+            if current in memo:
+                stack.pop()
+                continue
+
+            links = self._parent_links(current)
+            if current not in on_path:
+                on_path.add(current)
+                unresolved = [
+                    parent for _, parent in links
+                    if parent is not None and parent not in memo and parent not in on_path
+                ]
+                if unresolved:
+                    stack.extend(unresolved)
+                    continue
+
+            memo[current] = compute(current, links)
+            on_path.discard(current)
+            stack.pop()
+
+        return memo[key]
+
+    def _inherited_from_links(self, links):
+        """Gabungan tabel method semua induk proyek (tipe eksternal tidak diketahui isinya)."""
+        tables = [self._method_tables[parent] for _, parent in links if parent in self._method_tables]
+        if not tables:
+            return frozenset()
+        if len(tables) == 1:
+            return tables[0]
+        return frozenset().union(*tables)
+
+    def _method_table(self, key, links):
+        inherited = self._inherited_from_links(links)
+        own = self._classes[key][1]["methods"]
+        if inherited.issuperset(own):
+            # Tabel induk dipakai bersama, tidak disalin untuk setiap subclass
+            return inherited
+        return inherited.union(own)
+
+    def dit(self, key):
+        """Depth of Inheritance Tree untuk kelas proyek dengan nama lengkap `key`."""
+        return self._walk(key, self._depths, lambda _, links: self._depth_from_links(links))
+
+    def method_table(self, key):
+        """Method non-private yang dimiliki kelas `key`, termasuk warisan dari induk proyek."""
+        return self._walk(key, self._method_tables, self._method_table)
+
+    def nim(self, key):
+        """
+        Number of Inherited Methods: method dari induk proyek ditambah method
+        override yang asalnya dari tipe eksternal (isinya tidak ada di upload).
+        """
+        return self._nim_from_links(self._parent_links(key), self._classes[key][1])
+
+    def _nim_from_links(self, links, class_facts):
+        for _, parent in links:
+            if parent is not None:
+                self.method_table(parent)
+        inherited = self._inherited_from_links(links)
+        return len(inherited.union(class_facts["overrides"]))
+
+    def _is_registered(self, key, facts, class_facts):
+        """
+        True jika `class_facts` dari file `facts` adalah kelas yang terdaftar untuk `key`.
+
+        Dibandingkan berdasarkan nilai, karena fakta bisa berupa salinan (misalnya
+        setelah di-pickle ke spill iter_row_batches); import ikut dibandingkan
+        karena menentukan hasil resolve supertype.
+        """
+        registered_facts, registered_class = self._classes[key]
+        if registered_class is class_facts:
+            return True
+        return (
+            registered_class == class_facts
+            and registered_facts["imports"] == facts["imports"]
+            and registered_facts["wildcards"] == facts["wildcards"]
+        )
+
+    def class_values(self, facts):
+        """
+        (DIT_type, NIM_type) untuk setiap kelas top-level file `facts`, sesuai
+        urutan deklarasi; kelas bernama sama dalam satu file mendapat nilainya
+        masing-masing.
+        """
+        values = []
+        for class_facts in facts["classes"]:
+            key = self.qualified_name(facts, class_facts["name"])
+            if self._is_registered(key, facts, class_facts):
+                values.append((self.dit(key), self.nim(key)))
+            else:
+                # Duplikat nama lengkap (file lain atau file yang sama): hitung dari supertype-nya sendiri
+                links = [(name, self.resolve(facts, name)) for name in class_facts["supertypes"]]
+                for _, parent in links:
+                    if parent is not None:
+                        self.dit(parent)
+                values.append((self._depth_from_links(links), self._nim_from_links(links, class_facts)))
+        return values
@@ -0,0 +1,153 @@
+import json
+import os
+
+from . import controller as ct
+from .cache import content_digest
+from .columns import ResultColumns
+from .ingest import KOTLIN_EXTENSIONS, KotlinSource, iter_kotlin_paths
+from .report import REPORT_EXTENSIONS, REPORT_VERSION, file_report, report_from_results
+
+MANIFEST_VERSION = 1
+
+
+def load_manifest(state_path, version):
+    """Baca manifest run sebelumnya; manifest dari versi lain dianggap kosong."""
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get("manifest_version") != MANIFEST_VERSION or state.get("version") != version:
+        return {}
+    return state.get("files", {})
+
+
+def save_manifest(state_path, version, files):
+    """Simpan manifest secara atomik (tulis ke file sementara lalu rename)."""
+    directory = os.path.dirname(os.path.abspath(state_path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"manifest_version": MANIFEST_VERSION, "version": version, "files": files}, f)
+    os.replace(temp_path, state_path)
+
+
+def update_incremental(directory, state_path, process_changed, version, extensions=KOTLIN_EXTENSIONS, store=None):
+    """
+    Proses ulang hanya file yang berubah sejak run sebelumnya.
+
+    Manifest menyimpan path -> (size, mtime, hash) beserta hasil per file. File
+    dengan size dan mtime yang sama dianggap tidak berubah tanpa dibaca; jika
+    mtime berubah tetapi hash isinya sama, hasil lama tetap dipakai.
+
+    Args:
+        directory (str): Direktori proyek.
+        state_path (str): File JSON manifest (dibuat jika belum ada).
+        process_changed (callable): Menerima list KotlinSource dan mengembalikan
+            satu hasil (JSON-serializable) untuk setiap source, dengan urutan sama.
+        version: Versi hasil; manifest dengan versi berbeda diabaikan seluruhnya.
+        extensions (tuple): Ekstensi file yang diproses.
+        store (callable): Optional, menerima satu hasil dan mengembalikan False
+            jika hasil itu tidak boleh disimpan di manifest (misalnya baris error
+            sementara); file tersebut diproses lagi di run berikutnya.
+
+    Returns:
+        tuple: (list (path, hasil) terurut berdasarkan path, dict perubahan
+        berisi list "added", "changed", "deleted" dan jumlah "unchanged").
+    """
+    previous = load_manifest(state_path, version)
+    current = {}
+    to_process = []
+    touched = False
+    changes = {"added": [], "changed": [], "deleted": [], "unchanged": 0}
+
+    for path in iter_kotlin_paths(directory, extensions):
+        stat = os.stat(os.path.join(directory, path))
+        entry = previous.get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            current[path] = entry
+            changes["unchanged"] += 1
+            continue
+
+        with open(os.path.join(directory, path), "rb") as f:
+            data = f.read()
+        digest = content_digest(data)
+
+        if entry and entry["sha256"] == digest:
+            # Hanya mtime yang berubah (misalnya checkout ulang), hasil lama masih valid
+            current[path] = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            changes["unchanged"] += 1
+            touched = True
+            continue
+
+        changes["changed" if entry else "added"].append(path)
+        current[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        to_process.append(KotlinSource(path, data))
+
+    changes["deleted"] = sorted(set(previous) - set(current))
+
+    retry = {}
+    if to_process:
+        for source, result in zip(to_process, process_changed(to_process)):
+            if store is not None and not store(result):
+                # Tidak masuk manifest, jadi dianggap file baru di run berikutnya
+                del current[source.path]
+                retry[source.path] = result
+            else:
+                current[source.path]["result"] = result
+
+    # Simpan juga jika hanya mtime yang berubah, supaya run berikutnya tidak membaca ulang file itu
+    if to_process or changes["deleted"] or touched or not os.path.exists(state_path):
+        save_manifest(state_path, version, current)
+
+    results = {path: entry["result"] for path, entry in current.items()}
+    results.update(retry)
+    return [(path, results[path]) for path in sorted(results)], changes
+
+
+def extract_directory_incremental(directory, state_path, workers=None, cache=None, stats=None, budget=None):
+    """
+    Versi incremental dari extract_and_parse untuk direktori kerja lokal.
+
+    Hanya file yang ditambah/diubah yang di-parse ulang; baris file yang dihapus
+    dibuang, lalu hasil digabung kembali menjadi satu DataFrame.
+
+    Returns:
+        tuple: (DataFrame hasil, dict perubahan dari update_incremental)
+    """
+    entries, changes = update_incremental(
+        directory,
+        state_path,
+        lambda sources: ct.extract_file_results(sources, workers=workers, cache=cache, stats=stats, budget=budget),
+        version=ct.METRIC_SCHEMA_VERSION,
+        store=ct.is_storable,
+    )
+    # Manifest menyimpan hasil per file sebelum resolve, jadi DIT/NIM selalu dihitung
+    # ulang dari hierarki seluruh proyek (termasuk file yang tidak berubah)
+    results = [result for _, result in entries]
+    columns = ResultColumns()
+    for classes, result in zip(ct.resolve_file_results(results), results):
+        columns.extend_records(classes, result["methods"])
+    return columns.to_frame(), changes
+
+
+def report_directory_incremental(directory, state_path, project_name):
+    """
+    Versi incremental dari report.project_report untuk direktori kerja lokal.
+
+    Hanya file .kt yang ditambah/diubah yang dipindai dan dianalisis ulang; hasil
+    file lain (hitungan scanner dan NOLV/CYCLO per fungsi) diambil dari manifest.
+
+    Returns:
+        tuple: (DataFrame laporan per fungsi, scanner.ProjectScan, dict perubahan
+        dari update_incremental)
+    """
+    entries, changes = update_incremental(
+        directory,
+        state_path,
+        lambda sources: [file_report(source) for source in sources],
+        version=REPORT_VERSION,
+        extensions=REPORT_EXTENSIONS,
+    )
+    df, scan = report_from_results(project_name, [result for _, result in entries])
+    return df, scan, changes
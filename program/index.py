@@ -1,5 +1,81 @@
+import json
+import pandas as pd
 import streamlit as st
+from io import BytesIO
 from . import controller as ct
+from .cache import ResultCache
+from .columns import ResultColumns
+from .guard import DEFAULT_BUDGET
+from .profiling import PipelineStats
+from .session import (
+    background_job,
+    clear_job_button,
+    get_job_queue,
+    queued_job,
+    upload_digest,
+    wait_for_job,
+)
+
+
+@st.cache_resource
+def get_result_cache():
+    # Satu cache untuk semua sesi, hasil per file dipakai ulang antar upload
+    return ResultCache()
+
+
+def extract_upload(data, cache, progress=None):
+    # Dijalankan sebagai job background (lihat program/jobs.py); hasilnya disimpan
+    # per (hash upload, nama file) supaya rerun Streamlit tidak mengekstrak ulang
+    stats = PipelineStats()
+    columns = ResultColumns()
+    try:
+        # File yang melewati batas waktu/memori ditandai di kolom Error, sisanya tetap diproses.
+        # Baris setiap batch sudah final, jadi langsung ditampilkan sebagai hasil sementara
+        for batch in ct.iter_row_batches(BytesIO(data), cache=cache, stats=stats, budget=DEFAULT_BUDGET):
+            columns.extend_records(batch.classes, batch.methods)
+            if progress is not None:
+                progress(batch.done, batch.total, batch.path, batch.rows)
+    except Exception as e:
+        return ct.archive_error_frame(e), stats.to_dict()
+    with stats.stage("dataframe"):
+        df = columns.to_frame()
+    profile = stats.to_dict()
+    if cache is not None:
+        profile["cache"] = cache.stats()
+    return df, profile
+
+
+def show_partial_rows(rows, count):
+    """Baris terakhir dari file yang sudah selesai selama ekstraksi masih berjalan."""
+    st.caption(
+        f"{count} rows so far, showing the last {len(rows)} "
+        "(files with superclasses/interfaces appear once all files are parsed)"
+    )
+    st.dataframe(pd.DataFrame(rows))
+
+
+def show_profile(profile):
+    """Panel waktu per tahap/metrik dan file paling lambat dari run ekstraksi."""
+    with st.expander("Profiling"):
+        st.caption(f"{profile['files']} files parsed in this run (files served from cache are not timed)")
+        st.caption(
+            "ATFD, FANOUT_method, ATLD_method and CFNAMM share one AST walk per method, "
+            "timed together as class_model_method_walk; cfnamm_ratio is only the final ratio."
+        )
+        stages = pd.DataFrame(
+            [{"Stage": name, **values} for name, values in profile["stages"].items()]
+        )
+        st.dataframe(stages)
+        if profile["slowest_files"]:
+            st.write("Slowest files")
+            st.dataframe(pd.DataFrame(profile["slowest_files"]))
+        st.download_button(
+            "Download profile (JSON)",
+            json.dumps(profile, indent=2),
+            file_name="profile.json",
+            mime="application/json",
+        )
+
 
 def main():
     st.title("Kotlin Function Extractor")
@@ -7,12 +83,27 @@ def main():
     file = st.file_uploader("Upload a RAR or ZIP file containing Kotlin files", type=["rar", "zip"])
 
     if file is not None:
-        df = ct.extract_and_parse(file)
+        key = ("extract", upload_digest(file), file.name)
+        clear_job_button(key)
+        if get_job_queue() is not None:
+            # Parsing dikerjakan proses worker terpisah (python -m program.worker run)
+            job = queued_job(key, "Extracting metrics", "extract", file.getvalue())
+        else:
+            job = background_job(key, "Extracting metrics", extract_upload, file.getvalue(), get_result_cache())
+        result = wait_for_job(job, show_partial_rows)
+        if result is None:
+            return
+        df, profile = result
         if isinstance(df, str):
             st.error(f"Error extracting archive: {df}")
         else:
             st.dataframe(df)
+            # Statistik cache dari proses yang menjalankan ekstraksi (worker antrean atau proses ini)
+            stats = profile.get("cache")
+            if stats is not None:
+                st.caption(f"Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+            show_profile(profile)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,159 @@
+import os
+import zipfile
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from io import BytesIO
+from typing import Callable, NamedTuple
+
+try:
+    import rarfile
+except ImportError:  # rarfile opsional, hanya dibutuhkan untuk arsip RAR
+    rarfile = None
+
+KOTLIN_EXTENSIONS = (".kt", ".kts")
+
+# Signature RAR 4.x ("Rar!\x1a\x07\x00") dan RAR 5 ("Rar!\x1a\x07\x01\x00") berawalan sama
+RAR_SIGNATURE = b"Rar!\x1a\x07"
+
+# Direktori hasil build, cache IDE/VCS dan dependency yang tidak berisi source proyek
+SKIPPED_DIRS = frozenset({
+    "build", ".gradle", ".idea", ".git", ".svn", ".cxx", ".externalNativeBuild",
+    "node_modules", "__MACOSX",
+})
+
+
+class KotlinSource(NamedTuple):
+    """Satu file source: path relatif di dalam arsip/direktori dan isinya (bytes)."""
+    path: str
+    data: bytes
+
+
+class SourceRef(NamedTuple):
+    """Satu file source yang isinya belum dibaca (lihat open_kotlin_sources)."""
+    path: str
+    read: Callable[[], bytes]
+
+    def load(self):
+        """KotlinSource dengan isi file ini, dibaca saat dipanggil."""
+        return KotlinSource(self.path, self.read())
+
+
+def decode_source(data):
+    """Decode isi file seperti open(..., "r", encoding="utf-8"), termasuk normalisasi newline."""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def is_wanted(path, extensions=KOTLIN_EXTENSIONS):
+    """True jika path adalah file Kotlin yang tidak berada di direktori build/cache."""
+    parts = path.replace("\\", "/").split("/")
+    if any(part in SKIPPED_DIRS for part in parts[:-1]):
+        return False
+    return parts[-1].endswith(extensions)
+
+
+def _zip_refs(stack, archive, extensions):
+    # ZipFile membaca central directory lalu hanya mendekompresi member yang diminta
+    zf = stack.enter_context(zipfile.ZipFile(archive))
+    return [
+        SourceRef(info.filename, partial(zf.read, info))
+        for info in zf.infolist()
+        if not info.is_dir() and is_wanted(info.filename, extensions)
+    ]
+
+
+def _read_rar_member(rf, info):
+    try:
+        return rf.read(info)
+    except rarfile.RarCannotExec as e:
+        raise RuntimeError(
+            "No RAR backend available: rarfile needs unrar, unar, bsdtar or 7z on PATH"
+        ) from e
+
+
+def _rar_refs(stack, archive, extensions):
+    # rarfile bisa membaca member satu per satu sehingga hanya file .kt yang didekompresi.
+    # Tanpa rarfile atau backend lokalnya (unrar/unar/bsdtar/7z) RAR tidak diproses sama
+    # sekali, bukan diekstrak utuh ke disk seperti dulu lewat patoolib.
+    if rarfile is None:
+        raise RuntimeError("No RAR backend available: install the 'rarfile' package to read RAR archives")
+    rf = stack.enter_context(rarfile.RarFile(archive))
+    return [
+        SourceRef(info.filename, partial(_read_rar_member, rf, info))
+        for info in rf.infolist()
+        if not info.is_dir() and is_wanted(info.filename, extensions)
+    ]
+
+
+def iter_kotlin_paths(directory, extensions=KOTLIN_EXTENSIONS):
+    """Path relatif semua file Kotlin di direktori, tanpa masuk ke direktori build/cache."""
+    for root, dirs, files in os.walk(directory):
+        # Pangkas direktori build/cache supaya tidak ditelusuri sama sekali
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRS)
+        for name in sorted(files):
+            if name.endswith(extensions):
+                yield os.path.relpath(os.path.join(root, name), directory)
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _source_refs(stack, archive, extensions):
+    if isinstance(archive, (str, os.PathLike)):
+        if os.path.isdir(archive):
+            return [
+                SourceRef(path, partial(_read_file, os.path.join(archive, path)))
+                for path in iter_kotlin_paths(archive, extensions)
+            ]
+        archive = stack.enter_context(open(archive, "rb"))
+
+    if isinstance(archive, (bytes, bytearray, memoryview)):
+        archive = BytesIO(archive)
+
+    archive.seek(0)
+    if zipfile.is_zipfile(archive):
+        archive.seek(0)
+        return _zip_refs(stack, archive, extensions)
+
+    archive.seek(0)
+    signature = archive.read(len(RAR_SIGNATURE))
+    archive.seek(0)
+    if signature != RAR_SIGNATURE:
+        raise ValueError("Unsupported archive format: expected a ZIP or RAR file")
+    return _rar_refs(stack, archive, extensions)
+
+
+@contextmanager
+def open_kotlin_sources(archive, extensions=KOTLIN_EXTENSIONS):
+    """
+    Daftar file Kotlin di arsip ZIP/RAR atau direktori tanpa membaca isinya.
+
+    Hanya daftar member (central directory ZIP, header RAR, atau os.walk) yang
+    dibaca; isi setiap file baru dibaca dan didekompresi saat SourceRef.load()
+    dipanggil, selama blok `with` masih terbuka. Argumen sama dengan
+    iter_kotlin_sources.
+
+    Yields:
+        list: SourceRef sesuai urutan di arsip/direktori.
+    """
+    with ExitStack() as stack:
+        yield _source_refs(stack, archive, extensions)
+
+
+def iter_kotlin_sources(archive, extensions=KOTLIN_EXTENSIONS):
+    """
+    Baca file Kotlin langsung dari arsip ZIP/RAR atau direktori tanpa mengekstrak ke disk.
+
+    Args:
+        archive: Path direktori, path file arsip, bytes, atau file-like object
+            (misalnya hasil `st.file_uploader`).
+        extensions (tuple): Ekstensi file yang diambil.
+
+    Yields:
+        KotlinSource: Path relatif dan isi setiap file yang cocok. File di dalam
+        direktori build/cache (lihat SKIPPED_DIRS) dilewati.
+    """
+    with open_kotlin_sources(archive, extensions) as refs:
+        for ref in refs:
+            yield ref.load()
@@ -0,0 +1,255 @@
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from contextlib import closing
+
+# Lokasi default antrean: database SQLite plus spool berisi input dan hasil job
+DEFAULT_QUEUE_DIR = os.path.join(tempfile.gettempdir(), "kotlin_metrics_jobs")
+# Jika diisi, UI mengirim analisis ke antrean di direktori ini (dikerjakan program/worker.py)
+QUEUE_ENV = "KOTLIN_METRICS_JOB_QUEUE"
+# Jumlah maksimum job yang berjalan bersamaan per jenis job
+DEFAULT_LIMITS = {"extract": 2}
+# Job "running" tanpa heartbeat selama ini dianggap ditinggal worker yang mati
+STALE_SECONDS = 300
+# Jeda heartbeat worker selama job berjalan (harus jauh di bawah STALE_SECONDS)
+HEARTBEAT_SECONDS = 30
+# Jeda minimum antar penulisan progress ke database
+PROGRESS_INTERVAL = 0.5
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobQueue:
+    """
+    Antrean job persisten (SQLite + direktori spool) yang dipakai bersama oleh UI dan worker.
+
+    UI hanya memanggil submit lalu status/result; proses worker
+    (program/worker.py) mengambil job dengan claim sesuai prioritas tertinggi,
+    dengan batas jumlah job berjalan per jenis (tabel `limits`). Input job
+    (misalnya arsip upload) dan hasilnya (Parquet) disimpan sebagai file di
+    spool, jadi database tetap kecil.
+    """
+
+    def __init__(self, directory=DEFAULT_QUEUE_DIR, limits=None):
+        self.directory = directory
+        self.spool = os.path.join(directory, "spool")
+        os.makedirs(self.spool, exist_ok=True)
+        self.path = os.path.join(directory, "jobs.sqlite3")
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " key TEXT,"
+                " kind TEXT NOT NULL,"
+                " label TEXT NOT NULL,"
+                " params TEXT NOT NULL,"
+                " priority INTEGER NOT NULL,"
+                " status TEXT NOT NULL,"
+                " done INTEGER NOT NULL DEFAULT 0,"
+                " total INTEGER,"
+                " current TEXT,"
+                " error TEXT,"
+                " worker TEXT,"
+                " submitted REAL NOT NULL,"
+                " started REAL,"
+                " heartbeat REAL,"
+                " finished REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority, submitted)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key)")
+            conn.execute("CREATE TABLE IF NOT EXISTS limits (kind TEXT PRIMARY KEY, max_running INTEGER NOT NULL)")
+            conn.executemany(
+                "INSERT OR IGNORE INTO limits (kind, max_running) VALUES (?, ?)", DEFAULT_LIMITS.items()
+            )
+            if limits:
+                conn.executemany("INSERT OR REPLACE INTO limits (kind, max_running) VALUES (?, ?)", limits.items())
+
+    def _connect(self):
+        # Koneksi baru per operasi agar aman dipakai dari banyak thread dan proses
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _file(self, job_id, name):
+        return os.path.join(self.spool, f"{job_id}.{name}")
+
+    def submit(self, kind, payload, label=None, params=None, priority=0, key=None):
+        """
+        Masukkan job ke antrean.
+
+        Args:
+            kind (str): Jenis job, harus ada handler-nya di program/worker.py.
+            payload (bytes): Input job, misalnya isi arsip upload.
+            params (dict): Parameter tambahan untuk handler (JSON-serializable).
+            priority (int): Job dengan prioritas lebih tinggi diambil lebih dulu.
+            key (str): Optional, kunci hasil (misalnya hash upload). Jika sudah ada
+                job dengan kunci sama yang belum gagal, id job itu yang dikembalikan.
+
+        Returns:
+            str: Id job.
+        """
+        if key is not None:
+            existing = self.find(key)
+            if existing is not None and existing["status"] != FAILED:
+                return existing["id"]
+
+        job_id = uuid.uuid4().hex[:12]
+        with open(self._file(job_id, "input"), "wb") as f:
+            f.write(payload)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, key, kind, label, params, priority, status, submitted)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, key, kind, label or kind, json.dumps(params or {}), priority, QUEUED, time.time()),
+            )
+        return job_id
+
+    def status(self, job_id):
+        """Dict status job (kolom tabel jobs), atau None jika tidak ada."""
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def find(self, key):
+        """Status job terbaru dengan `key`, atau None."""
+        with closing(self._connect()) as conn:
+            found = conn.execute(
+                "SELECT id FROM jobs WHERE key = ? ORDER BY submitted DESC LIMIT 1", (key,)
+            ).fetchone()
+        return self.status(found[0]) if found else None
+
+    def discard(self, key):
+        """Lepaskan `key` dari job lama sehingga submit berikutnya menjalankan ulang analisis."""
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE jobs SET key = NULL WHERE key = ?", (key,))
+
+    def jobs(self, limit=50):
+        """Status job terbaru, untuk ditampilkan oleh worker/CLI."""
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM jobs ORDER BY submitted DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def set_limit(self, kind, max_running):
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT OR REPLACE INTO limits (kind, max_running) VALUES (?, ?)", (kind, max_running))
+
+    def claim(self, worker_id, kinds=None):
+        """
+        Ambil satu job antrean untuk `worker_id`, atau None jika tidak ada yang boleh jalan.
+
+        Job diurutkan berdasarkan prioritas lalu waktu submit; jenis job yang
+        jumlah job berjalannya sudah mencapai batas di tabel `limits` dilewati.
+        Seluruh pemilihan terjadi dalam satu transaksi IMMEDIATE, jadi dua worker
+        tidak pernah mengambil job yang sama. Job yang file input-nya sudah tidak
+        ada ditandai gagal (dan None dikembalikan) supaya worker tetap berjalan.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                running = dict(conn.execute(
+                    "SELECT kind, COUNT(*) FROM jobs WHERE status = ? GROUP BY kind", (RUNNING,)
+                ).fetchall())
+                limits = dict(conn.execute("SELECT kind, max_running FROM limits").fetchall())
+                candidates = conn.execute(
+                    "SELECT id, kind FROM jobs WHERE status = ? ORDER BY priority DESC, submitted",
+                    (QUEUED,),
+                )
+                chosen = None
+                for job_id, kind in candidates:
+                    if kinds is not None and kind not in kinds:
+                        continue
+                    limit = limits.get(kind)
+                    if limit is None or running.get(kind, 0) < limit:
+                        chosen = job_id
+                        break
+                if chosen is not None:
+                    now = time.time()
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, started = ?, heartbeat = ? WHERE id = ?",
+                        (RUNNING, worker_id, now, now, chosen),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        if chosen is None:
+            return None
+        job = self.status(chosen)
+        job["params"] = json.loads(job["params"])
+        try:
+            with open(self._file(chosen, "input"), "rb") as f:
+                job["payload"] = f.read()
+        except FileNotFoundError:
+            # Input sudah dihapus (misalnya job sudah diselesaikan run lain); jangan biarkan job tergantung
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ? AND status = ? AND worker = ?",
+                    (FAILED, "Job input file is missing", time.time(), chosen, RUNNING, worker_id),
+                )
+            return None
+        return job
+
+    def heartbeat(self, job_id):
+        """Tandai job yang sedang berjalan masih hidup (lihat requeue_stale)."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING)
+            )
+
+    def progress_callback(self, job_id):
+        """Callback `progress(done, total, path, rows)` yang mencatat progress job (dibatasi PROGRESS_INTERVAL)."""
+        last = [0.0]
+
+        def progress(done, total, path, rows=()):
+            now = time.time()
+            if now - last[0] < PROGRESS_INTERVAL and done != total:
+                return
+            last[0] = now
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "UPDATE jobs SET done = ?, total = ?, current = ?, heartbeat = ? WHERE id = ?",
+                    (done, total, path, now, job_id),
+                )
+
+        return progress
+
+    def complete(self, job_id, df, meta=None):
+        """Simpan hasil job (DataFrame sebagai Parquet, `meta` sebagai JSON) dan tandai selesai."""
+        df.to_parquet(self._file(job_id, "parquet"), index=False)
+        with open(self._file(job_id, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta or {}, f)
+        self._finish(job_id, DONE, None)
+
+    def fail(self, job_id, error):
+        self._finish(job_id, FAILED, error)
+
+    def _finish(self, job_id, status, error):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?",
+                (status, error, time.time(), job_id),
+            )
+        try:
+            os.remove(self._file(job_id, "input"))
+        except OSError:
+            pass
+
+    def result(self, job_id):
+        """(DataFrame, meta) dari job yang selesai."""
+        import pandas as pd
+
+        df = pd.read_parquet(self._file(job_id, "parquet"))
+        with open(self._file(job_id, "meta.json"), "r", encoding="utf-8") as f:
+            return df, json.load(f)
+
+    def requeue_stale(self, seconds=STALE_SECONDS):
+        """Kembalikan job "running" yang worker-nya berhenti mengirim heartbeat ke antrean."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, started = NULL WHERE status = ? AND heartbeat < ?",
+                (QUEUED, RUNNING, time.time() - seconds),
+            ).rowcount
@@ -0,0 +1,141 @@
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Jumlah job yang dijalankan bersamaan, jumlah job selesai yang disimpan dan
+# berapa lama (detik) hasil job selesai disimpan
+JOB_WORKERS = 2
+JOB_HISTORY = 16
+JOB_TTL_SECONDS = 60 * 60
+# Jumlah baris sementara terakhir yang disimpan per job untuk pratinjau di UI
+JOB_PARTIAL_ROWS = 200
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    """
+    Satu analisis yang berjalan di background.
+
+    Fungsi job menerima `progress(done, total, path, rows)` (lihat
+    controller.extract_files); hanya JOB_PARTIAL_ROWS baris terakhir yang dikirim
+    lewat progress disimpan sebagai pratinjau (plus jumlah seluruhnya di
+    `partial_count`) sampai `result` tersedia, jadi hasil tidak tersimpan dua kali.
+    """
+
+    __slots__ = ("id", "key", "label", "status", "done", "total", "current",
+                 "partial", "partial_count", "result", "error", "submitted", "finished", "_lock")
+
+    def __init__(self, key, label):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.label = label
+        self.status = QUEUED
+        self.done = 0
+        self.total = None
+        self.current = None
+        self.partial = deque(maxlen=JOB_PARTIAL_ROWS)
+        self.partial_count = 0
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def progress(self, done, total, path, rows=()):
+        with self._lock:
+            self.done, self.total, self.current = done, total, path
+            self.partial.extend(rows)
+            self.partial_count += len(rows)
+
+    def partial_rows(self):
+        """Salinan baris sementara terakhir, aman dibaca selagi job masih berjalan."""
+        with self._lock:
+            return list(self.partial)
+
+    def is_finished(self):
+        return self.status in (DONE, FAILED)
+
+
+class JobManager:
+    """
+    Menjalankan analisis di thread background dan menyimpan hasilnya per kunci.
+
+    Parsing berat tetap terjadi di process pool/worker milik controller; thread
+    job hanya mengoordinasikan, jadi rerun Streamlit dan halaman lain tidak
+    terblokir. Job dicari lewat id atau kunci (misalnya hash upload), sehingga
+    pengguna bisa pindah halaman lalu kembali ke hasil yang sudah selesai.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, history=JOB_HISTORY, ttl=JOB_TTL_SECONDS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-job")
+        self._history = history
+        self._ttl = ttl
+        self._jobs = {}  # id -> Job, urut sesuai waktu submit
+        self._keys = {}  # kunci -> id job terbaru
+        self._lock = threading.Lock()
+
+    def submit(self, key, label, function, *args, **kwargs):
+        """
+        Jalankan `function(*args, progress=..., **kwargs)` di background.
+
+        Returns:
+            Job: Job baru; `job.id` bisa disimpan di st.session_state.
+        """
+        job = Job(key, label)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._keys[key] = job.id
+            self._prune()
+        self._executor.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def find(self, key):
+        """Job terbaru untuk `key`, atau None."""
+        with self._lock:
+            self._prune()
+            job_id = self._keys.get(key)
+            return self._jobs.get(job_id) if job_id else None
+
+    def discard(self, key):
+        """Lupakan job untuk `key` sehingga submit berikutnya menjalankan ulang analisis."""
+        with self._lock:
+            job_id = self._keys.pop(key, None)
+            if job_id is not None and self._jobs[job_id].is_finished():
+                del self._jobs[job_id]
+
+    def _run(self, job, function, args, kwargs):
+        job.status = RUNNING
+        # `finished` diisi sebelum status berubah, karena _prune (dipanggil dari find di
+        # thread lain) menganggap job DONE/FAILED selalu punya waktu selesai
+        try:
+            job.result = function(*args, progress=job.progress, **kwargs)
+            job.finished = time.time()
+            job.status = DONE
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.finished = time.time()
+            job.status = FAILED
+        finally:
+            with job._lock:
+                job.partial.clear()  # Hasil akhir sudah ada, baris sementara tidak dibutuhkan lagi
+            with self._lock:
+                self._prune()
+
+    def _prune(self):
+        # Buang job selesai yang melewati TTL lalu yang paling lama di luar `history`;
+        # job yang masih berjalan tidak pernah dibuang
+        finished = [job for job in self._jobs.values() if job.is_finished() and job.finished is not None]
+        expired = time.time() - self._ttl
+        stale = [job for job in finished if job.finished < expired]
+        fresh = [job for job in finished if job.finished >= expired]
+        for job in stale + fresh[:max(0, len(fresh) - self._history)]:
+            del self._jobs[job.id]
+            if self._keys.get(job.key) == job.id:
+                del self._keys[job.key]
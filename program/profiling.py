@@ -0,0 +1,100 @@
+import heapq
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Jumlah file paling lambat yang disimpan di PipelineStats
+SLOWEST_FILES = 10
+
+
+class StageTimer:
+    """
+    Total waktu (detik) dan jumlah panggilan per tahap.
+
+    Hanya memakai time.perf_counter dan dict, jadi cukup murah untuk selalu
+    aktif; extract_file memakainya di dalam worker lalu mengirim hasilnya
+    bersama baris metrik.
+    """
+
+    __slots__ = ("timings",)
+
+    def __init__(self):
+        self.timings = {}  # nama tahap -> [detik, jumlah panggilan]
+
+    def add(self, name, seconds, calls=1):
+        entry = self.timings.get(name)
+        if entry is None:
+            self.timings[name] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def merge(self, timings):
+        """Tambahkan timings dari StageTimer lain (misalnya dari worker)."""
+        for name, (seconds, calls) in timings.items():
+            self.add(name, seconds, calls)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+
+class PipelineStats(StageTimer):
+    """
+    Statistik satu run ekstraksi: waktu per tahap/metrik dan file paling lambat.
+
+    Buat objek ini lalu kirim sebagai `stats=` ke extract_and_parse (atau
+    extract_files); setelah selesai baca `to_dict()` atau simpan dengan `dump()`.
+    """
+
+    __slots__ = ("slowest", "file_count", "_slowest_files")
+
+    def __init__(self, slowest=SLOWEST_FILES):
+        super().__init__()
+        self.slowest = slowest
+        self.file_count = 0
+        self._slowest_files = []  # min-heap (detik, path) berisi `slowest` file terlama
+
+    def add_file(self, path, seconds, timings=None):
+        """Catat satu file yang selesai diproses beserta timings per tahapnya."""
+        self.file_count += 1
+        if timings:
+            self.merge(timings)
+        if len(self._slowest_files) < self.slowest:
+            heapq.heappush(self._slowest_files, (seconds, path))
+        elif seconds > self._slowest_files[0][0]:
+            heapq.heapreplace(self._slowest_files, (seconds, path))
+
+    def slowest_files(self):
+        """List (path, detik) file paling lambat, urut dari yang terlama."""
+        return [(path, seconds) for seconds, path in sorted(self._slowest_files, reverse=True)]
+
+    def to_dict(self):
+        return {
+            "files": self.file_count,
+            "stages": {
+                name: {
+                    "seconds": round(seconds, 6),
+                    "calls": calls,
+                    "mean_ms": round(seconds / calls * 1000, 3) if calls else 0.0,
+                }
+                for name, (seconds, calls) in sorted(self.timings.items(), key=lambda item: -item[1][0])
+            },
+            "slowest_files": [
+                {"path": path, "seconds": round(seconds, 6)} for path, seconds in self.slowest_files()
+            ],
+        }
+
+    def dump(self, path):
+        """Simpan to_dict() sebagai JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def stage(stats, name):
+    """stats.stage(name) jika `stats` ada, selain itu context manager kosong."""
+    return stats.stage(name) if stats is not None else nullcontext()
@@ -0,0 +1,197 @@
+import re
+from datetime import datetime
+
+from . import scanner
+from .columns import RecordColumns
+from .ingest import decode_source, open_kotlin_sources
+
+# Kolom laporan per fungsi (tipe seperti program/columns.py). Package, Class dan jumlah
+# konstruktor non-default disimpan sekali per kelas, bukan diulang di setiap baris fungsi
+FUNCTION_REPORT_COLUMNS = (
+    ("Package", "category"),
+    ("Class", "category"),
+    ("Function", "str"),
+    ("NOLV_METHOD", "q"),
+    ("CYCLO_METHOD", "q"),
+    ("NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD", "q"),
+)
+FUNCTION_REPORT_CLASS_COLUMNS = ("Package", "Class", "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD")
+
+# Ekstensi yang dibaca laporan per fungsi dan ringkasan kompleksitas (sama dengan UI)
+REPORT_EXTENSIONS = (".kt",)
+
+# Versi hasil file_report; manifest incremental dengan versi lain diabaikan
+REPORT_VERSION = "report-1"
+
+
+# Fungsi untuk menghitung NOLV_METHOD (jumlah variabel lokal)
+def calculate_nolv(function_content):
+    # Memecah kode menjadi baris-baris
+    lines = function_content.split("\n")
+    local_variables = set()
+
+    # Memeriksa setiap baris untuk menemukan deklarasi variabel lokal
+    for line in lines:
+        line = line.strip()
+
+        # Mencari 'val' atau 'var' untuk deklarasi variabel lokal
+        if line.startswith("val") or line.startswith("var"):
+            parts = line.split("=")
+            if len(parts) > 1:
+                variable = parts[0].strip().split()[-1]  # Mendapatkan nama variabel
+                local_variables.add(variable)
+
+    return len(local_variables)
+
+
+# Fungsi untuk menghitung CYCLO_METHOD (kompleksitas siklomatik)
+def calculate_cyclomatic_complexity(function_content):
+    # Mencari semua cabang logis dalam konten menggunakan kata kunci kontrol alur
+    logical_branches = re.findall(
+        r"\b(if|else|for|while|when|switch|case|try|catch)\b", function_content
+    )
+    return len(logical_branches) + 1  # +1 untuk fungsi itu sendiri
+
+
+# Fungsi untuk menghitung NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD
+def count_non_default_constructors(content, class_name):
+    # Mencari konstruktor dalam kelas dengan nama class_name
+    constructors = re.findall(
+        rf"class\s+{class_name}\s*.*?\((.*?)\)", content, re.DOTALL
+    )
+    non_default_constructors = 0  # Inisialisasi penghitung konstruktor non-default
+    for constructor in constructors:
+        # Jika ada parameter dalam konstruktor, itu berarti konstruktor non-default
+        if constructor and not re.match(r"\s*\)", constructor):
+            non_default_constructors += 1
+    return non_default_constructors  # Mengembalikan jumlah konstruktor non-default
+
+
+# Fungsi untuk mencari semua fungsi dalam konten file Kotlin
+def find_functions(content):
+    # Mengembalikan semua nama fungsi yang ditemukan dalam konten
+    return re.findall(r"fun\s+(\w+)\s*\(", content)
+
+
+# Fungsi untuk mencari semua kelas dalam konten file Kotlin
+def find_classes(content):
+    # Mengembalikan semua nama kelas yang ditemukan dalam konten
+    return re.findall(r"class\s+(\w+)", content)
+
+
+def function_metrics(content):
+    """
+    Metrik per fungsi satu file Kotlin (JSON-serializable): paket, kelas beserta
+    jumlah konstruktor non-default, dan (fungsi, NOLV, CYCLO) untuk setiap fungsi.
+    """
+    # Mencari nama paket dalam file Kotlin
+    package_name = re.search(r"package\s+([\w\.]+)", content)
+    package = package_name.group(1) if package_name else "default"
+
+    # Memetakan setiap fungsi ke body-nya sekali per file, lalu menghitung
+    # NOLV dan CYCLO sekali per fungsi (overload mendapat body masing-masing)
+    functions = []
+    for span in scanner.index_function_bodies(content):
+        function_content = span.body(content)
+        functions.append([
+            span.name,
+            calculate_nolv(function_content),
+            calculate_cyclomatic_complexity(function_content),
+        ])
+
+    classes = [
+        [class_name, count_non_default_constructors(content, class_name)]
+        for class_name in find_classes(content)
+    ]
+    return {"package": package, "classes": classes, "functions": functions}
+
+
+def function_report_columns(project_name):
+    """RecordColumns kosong untuk laporan per fungsi satu proyek."""
+    # Tanggal ekstraksi dan nama proyek hanya disimpan sekali, bukan di setiap baris
+    return RecordColumns(
+        FUNCTION_REPORT_COLUMNS,
+        FUNCTION_REPORT_CLASS_COLUMNS,
+        constants={"Extraction Date": datetime.now().strftime("%Y-%m-%d"), "Project": project_name},
+    )
+
+
+def add_function_rows(report, metrics, rows=None):
+    """
+    Tambahkan hasil function_metrics satu file ke `report`. Setiap fungsi file
+    dicatat untuk setiap kelas di file itu; jika `rows` diisi, baris yang sama
+    juga ditambahkan ke list itu sebagai dict (hasil sementara di UI).
+    """
+    package = metrics["package"]
+    for class_name, non_default_constructors in metrics["classes"]:
+        class_id = report.add_group((package, class_name, non_default_constructors))
+        for function, nolv, cyclo in metrics["functions"]:
+            report.append_row(class_id, (function, nolv, cyclo))
+            if rows is not None:
+                rows.append({
+                    "Package": package,
+                    "Class": class_name,
+                    "Function": function,
+                    "NOLV_METHOD": nolv,
+                    "CYCLO_METHOD": cyclo,
+                    "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD": non_default_constructors,
+                })
+
+
+def analyze_kotlin_files_per_function(zip_file, project_name, progress=None):
+    """
+    Laporan NOLV/CYCLO per fungsi untuk semua file .kt di arsip/direktori.
+
+    Member dibaca langsung dari arsip (program/ingest.py), tanpa folder kerja
+    bersama di disk, dan isi setiap file baru dibaca saat gilirannya.
+    `progress(done, total, path, rows)` opsional dipanggil setiap satu file selesai.
+
+    Returns:
+        DataFrame: Kolom Extraction Date dan Project bertipe category satu nilai,
+        Package/Class bertipe category.
+    """
+    report = function_report_columns(project_name)
+    with open_kotlin_sources(zip_file, extensions=REPORT_EXTENSIONS) as sources:
+        for done, ref in enumerate(sources, start=1):
+            source = ref.load()
+            file_rows = [] if progress is not None else None
+            add_function_rows(report, function_metrics(decode_source(source.data)), file_rows)
+            if progress is not None:
+                progress(done, len(sources), source.path, file_rows)
+    return report.to_frame()
+
+
+def file_report(source):
+    """
+    Hasil laporan satu KotlinSource (JSON-serializable, bisa disimpan di manifest
+    program/incremental.py): hitungan scanner dan metrik per fungsinya.
+    """
+    return {
+        "scan": scanner.scan_source(source).to_dict(),
+        "functions": function_metrics(decode_source(source.data)),
+    }
+
+
+def report_from_results(project_name, results):
+    """
+    Gabungkan hasil file_report beberapa file menjadi laporan satu proyek.
+
+    Returns:
+        tuple: (DataFrame seperti analyze_kotlin_files_per_function, scanner.ProjectScan)
+    """
+    report = function_report_columns(project_name)
+    scans = []
+    for result in results:
+        scans.append(scanner.FileScan.from_dict(result["scan"]))
+        add_function_rows(report, result["functions"])
+    return report.to_frame(), scanner.ProjectScan(scans)
+
+
+def project_report(archive, project_name):
+    """
+    Laporan per fungsi dan hasil pindai proyek (ringkasan dan kompleksitas)
+    dalam satu kali baca arsip/direktori; hasilnya sama dengan report_from_results.
+    """
+    with open_kotlin_sources(archive, extensions=REPORT_EXTENSIONS) as sources:
+        results = [file_report(ref.load()) for ref in sources]
+    return report_from_results(project_name, results)
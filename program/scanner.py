@@ -0,0 +1,330 @@
+import os
+import re
+from io import StringIO
+
+from .ingest import decode_source, iter_kotlin_sources
+
+# Satu regex untuk kelas, fungsi dan properti, jadi isi file cukup dipindai sekali
+_DECLARATION_RE = re.compile(r"(?P<cls>class\s+\w+)|(?P<fun>fun\s+\w+)|(?P<prop>val\s+\w+|var\s+\w+)")
+_PACKAGE_RE = re.compile(r"package\s+([\w\.]+)")
+# Kata kunci struktur kontrol untuk kompleksitas kognitif dan MCC (dicocokkan sebagai substring)
+_CONTROL_RE = re.compile(r"if|else|for|while|do|when|switch|case|try|catch")
+
+# Panjang baris (tanpa spasi di awal/akhir) yang dianggap code smell
+LONG_LINE_LIMIT = 100
+
+
+class FileScan:
+    """Semua hitungan berbasis teks untuk satu file Kotlin."""
+
+    __slots__ = (
+        "path", "package", "classes", "functions", "properties",
+        "loc", "sloc", "lloc", "cloc", "control_lines", "code_smells",
+    )
+
+    def __init__(self, path, package="default", classes=(), functions=(), properties=(),
+                 loc=0, sloc=0, lloc=0, cloc=0, control_lines=0, code_smells=0):
+        self.path = path
+        self.package = package
+        self.classes = list(classes)
+        self.functions = list(functions)
+        self.properties = list(properties)
+        self.loc = loc
+        self.sloc = sloc
+        self.lloc = lloc
+        self.cloc = cloc
+        self.control_lines = control_lines
+        self.code_smells = code_smells
+
+    def to_dict(self):
+        """Semua hitungan sebagai dict JSON-serializable (misalnya untuk manifest incremental)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+
+def scan_source(source):
+    """Pindai satu KotlinSource: deklarasi, paket dan hitungan baris dalam satu kali baca."""
+    content = decode_source(source.data)
+    scan = FileScan(source.path)
+
+    for match in _DECLARATION_RE.finditer(content):
+        kind = match.lastgroup
+        if kind == "cls":
+            scan.classes.append(match.group())
+        elif kind == "fun":
+            scan.functions.append(match.group())
+        else:
+            scan.properties.append(match.group())
+
+    package_match = _PACKAGE_RE.search(content)
+    if package_match:
+        scan.package = package_match.group(1)
+
+    # Sama seperti f.readlines(): baris dipisah hanya pada "\n"
+    lines = StringIO(content).readlines()
+    scan.loc = len(lines)
+    for line in lines:
+        stripped_line = line.strip()
+        if len(stripped_line) > LONG_LINE_LIMIT:
+            scan.code_smells += 1
+        if stripped_line.startswith("//"):
+            scan.cloc += 1
+        elif stripped_line != "":
+            scan.sloc += 1
+            scan.lloc += 1
+            if _CONTROL_RE.search(stripped_line):
+                scan.control_lines += 1
+
+    return scan
+
+
+class ProjectScan:
+    """
+    Hasil pindai seluruh proyek, dipakai bersama oleh halaman Summary,
+    Detailed dan Complexity supaya proyek tidak dipindai ulang per halaman.
+    """
+
+    def __init__(self, files=()):
+        self.files = list(files)
+
+    @classmethod
+    def from_sources(cls, sources):
+        return cls(scan_source(source) for source in sources)
+
+    def summary(self):
+        """Ringkasan per proyek dan per paket (format sama dengan analyze_kotlin_files)."""
+        package_dict = {}
+        for scan in self.files:
+            details = package_dict.setdefault(scan.package, {
+                "files": [],
+                "classes": [],
+                "functions": [],
+                "properties": [],
+            })
+            details["files"].append(os.path.basename(scan.path))
+            details["classes"].extend(scan.classes)
+            details["functions"].extend(scan.functions)
+            details["properties"].extend(scan.properties)
+
+        return {
+            "number of files": len(self.files),
+            "number of classes": sum(len(scan.classes) for scan in self.files),
+            "number of functions": sum(len(scan.functions) for scan in self.files),
+            "number of properties": sum(len(scan.properties) for scan in self.files),
+            "number of packages": len(package_dict),
+            "Packages": package_dict,
+        }
+
+    def complexity(self):
+        """Laporan kompleksitas (format sama dengan calculate_complexity_report)."""
+        loc = sum(scan.loc for scan in self.files)
+        sloc = sum(scan.sloc for scan in self.files)
+        lloc = sum(scan.lloc for scan in self.files)
+        cloc = sum(scan.cloc for scan in self.files)
+        control_lines = sum(scan.control_lines for scan in self.files)
+        code_smells = sum(scan.code_smells for scan in self.files)
+
+        return {
+            "loc": loc,
+            "sloc": sloc,
+            "lloc": lloc,
+            "cloc": cloc,
+            # Kompleksitas kognitif dan MCC sama-sama menghitung baris berisi struktur kontrol
+            "cognitive_complexity": control_lines,
+            "code_smells": code_smells,
+            "comment_ratio": (cloc / sloc) * 100 if sloc > 0 else 0,
+            "mcc_per_1000_lloc": control_lines / (lloc / 1000) if lloc > 0 else 0,
+            "code_smells_per_1000_lloc": code_smells / (lloc / 1000) if lloc > 0 else 0,
+        }
+
+
+# Awal token yang mengubah state tokenizer: raw string, string, char literal, komentar
+_SPECIAL_RE = re.compile(r'"""|"|\'|//|/\*')
+_LINE_STRING_RE = re.compile(r'\\.|"|\$\{|\n')
+_BLOCK_COMMENT_RE = re.compile(r"/\*|\*/")
+_CHAR_LITERAL_RE = re.compile(r"'(?:\\.|[^'\\\n])*'")
+_BRACKET_RE = re.compile(r"[{}()]")
+_FUNCTION_DECL_RE = re.compile(r"fun\s+(\w+)\s*\(")
+
+
+class FunctionSpan:
+    """Lokasi satu deklarasi fungsi dan body-nya di dalam isi file."""
+
+    __slots__ = ("name", "start", "body_start", "body_end")
+
+    def __init__(self, name, start, body_start, body_end):
+        self.name = name
+        self.start = start
+        self.body_start = body_start
+        self.body_end = body_end
+
+    def body(self, content):
+        return content[self.body_start:self.body_end].strip()
+
+
+def _blank(text):
+    # Ganti semua karakter selain newline dengan spasi, panjang tetap sama
+    return re.sub(r"[^\n]", " ", text)
+
+
+def _skip_template(content, i):
+    """Posisi setelah '}' penutup template ${...} yang dimulai di `i` (setelah '${')."""
+    depth = 1
+    n = len(content)
+    while i < n and depth:
+        char = content[i]
+        if char == '"':
+            i = _skip_line_string(content, i + 1)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        i += 1
+    return i
+
+
+def _skip_line_string(content, i):
+    """Posisi setelah '"' penutup string satu baris yang isinya dimulai di `i`."""
+    while True:
+        match = _LINE_STRING_RE.search(content, i)
+        if match is None:
+            return len(content)
+        token = match.group()
+        if token == '"':
+            return match.end()
+        if token == "\n":
+            # String tidak ditutup di baris yang sama; anggap selesai di sini
+            return match.start()
+        if token == "${":
+            i = _skip_template(content, match.end())
+        else:
+            i = match.end()
+
+
+def mask_code(content):
+    """
+    Salinan `content` dengan isi string, char literal dan komentar diganti spasi.
+
+    Panjang dan posisi newline tidak berubah, jadi indeks pada hasil mask
+    langsung berlaku untuk isi aslinya.
+    """
+    parts = []
+    i = 0
+    n = len(content)
+    while i < n:
+        match = _SPECIAL_RE.search(content, i)
+        if match is None:
+            parts.append(content[i:])
+            break
+
+        start = match.start()
+        parts.append(content[i:start])
+        token = match.group()
+
+        if token == "//":
+            end = content.find("\n", start)
+            end = n if end == -1 else end
+        elif token == "/*":
+            # Komentar blok Kotlin boleh bersarang
+            depth = 0
+            end = n
+            for comment in _BLOCK_COMMENT_RE.finditer(content, start):
+                depth += 1 if comment.group() == "/*" else -1
+                if depth == 0:
+                    end = comment.end()
+                    break
+        elif token == '"""':
+            end = content.find('"""', start + 3)
+            end = n if end == -1 else end + 3
+            while end < n and content[end] == '"':
+                end += 1
+        elif token == '"':
+            end = _skip_line_string(content, start + 1)
+        else:
+            literal = _CHAR_LITERAL_RE.match(content, start)
+            end = literal.end() if literal else start + 1
+
+        parts.append(_blank(content[start:end]))
+        i = end
+
+    return "".join(parts)
+
+
+def _match_brackets(code):
+    """Pasangan posisi kurung {} dan () dalam satu kali lintasan; yang tidak berpasangan diabaikan."""
+    pairs = {}
+    stacks = {"{": [], "(": []}
+    for match in _BRACKET_RE.finditer(code):
+        char = match.group()
+        position = match.start()
+        if char in stacks:
+            stacks[char].append(position)
+        else:
+            stack = stacks["{" if char == "}" else "("]
+            if stack:
+                pairs[stack.pop()] = position
+    return pairs
+
+
+def _find_body(code, pairs, i):
+    """Cari body fungsi mulai dari posisi `i` (setelah daftar parameter)."""
+    n = len(code)
+    while i < n:
+        char = code[i]
+        if char == "{":
+            return i, pairs.get(i, n - 1) + 1
+        if char == "=":
+            # Expression body: sampai akhir baris, ikut blok yang dibuka di baris itu
+            end = i + 1
+            while end < n and code[end] != "\n":
+                if code[end] == "{":
+                    end = pairs.get(end, n - 1)
+                elif code[end] == "(":
+                    end = pairs.get(end, end)
+                end += 1
+            return i + 1, end
+        if char in "};":
+            return None
+        if char == "\n":
+            # Deklarasi lanjut di baris berikutnya hanya jika baris itu diawali :, {, = atau where
+            rest = code[i + 1:i + 200].lstrip()
+            if not rest.startswith((":", "{", "=", "where")):
+                return None
+        i += 1
+    return None
+
+
+def index_function_bodies(content):
+    """
+    Petakan setiap deklarasi `fun nama(` di luar string/komentar ke span body-nya.
+
+    Seluruh file diproses sekali: string dan komentar di-mask, lalu semua
+    pasangan kurung dicocokkan dalam satu lintasan. Fungsi overload mendapat
+    body masing-masing; fungsi tanpa body (abstract/interface) mendapat body kosong.
+
+    Returns:
+        list: FunctionSpan sesuai urutan kemunculan di file.
+    """
+    code = mask_code(content)
+    pairs = _match_brackets(code)
+    spans = []
+
+    for match in _FUNCTION_DECL_RE.finditer(code):
+        open_paren = match.end() - 1
+        close_paren = pairs.get(open_paren)
+        body = _find_body(code, pairs, close_paren + 1) if close_paren is not None else None
+        if body is None:
+            spans.append(FunctionSpan(match.group(1), match.start(), match.end(), match.end()))
+        else:
+            spans.append(FunctionSpan(match.group(1), match.start(), body[0], body[1]))
+
+    return spans
+
+
+def scan_project(archive, extensions=(".kt",)):
+    """Pindai arsip/direktori sekali dan kembalikan ProjectScan."""
+    return ProjectScan.from_sources(iter_kotlin_sources(archive, extensions=extensions))
@@ -0,0 +1,138 @@
+import json
+import os
+import time
+
+import streamlit as st
+
+from .cache import content_digest
+from .jobqueue import QUEUE_ENV, JobQueue
+from .jobs import DONE, FAILED, JobManager
+
+# Batas memori hasil analisis per upload yang disimpan antar rerun Streamlit
+RESULT_TTL_SECONDS = 60 * 60
+RESULT_MAX_ENTRIES = 8
+# Jeda sebelum halaman di-rerun untuk membaca progress job background
+JOB_POLL_SECONDS = 1.0
+
+
+def upload_digest(uploaded_file):
+    """Hash isi file upload, dipakai sebagai kunci hasil analisis."""
+    return content_digest(uploaded_file.getvalue())
+
+
+def memoize_results(show_spinner=True):
+    """
+    Dekorator st.cache_data dengan batas TTL dan jumlah entri (LRU).
+
+    Argumen yang diawali "_" tidak ikut di-hash oleh Streamlit, jadi isi upload
+    dikirim sebagai `_data` dan kuncinya cukup hash isi upload plus nama proyek.
+    """
+    return st.cache_data(ttl=RESULT_TTL_SECONDS, max_entries=RESULT_MAX_ENTRIES, show_spinner=show_spinner)
+
+
+@st.cache_resource
+def get_job_manager():
+    # Satu manager untuk semua sesi; job tetap berjalan saat pengguna pindah halaman.
+    # Hasil job selesai dibuang setelah RESULT_TTL_SECONDS, sama seperti memoize_results
+    return JobManager(ttl=RESULT_TTL_SECONDS)
+
+
+@st.cache_resource
+def get_job_queue():
+    # Antrean bersama dengan program/worker.py; None berarti analisis berjalan di proses Streamlit
+    directory = os.environ.get(QUEUE_ENV)
+    return JobQueue(directory) if directory else None
+
+
+class QueuedJob:
+    """Status job di JobQueue dengan atribut yang sama seperti jobs.Job, untuk wait_for_job."""
+
+    def __init__(self, queue, status):
+        self._queue = queue
+        self.id = status["id"]
+        self.label = status["label"]
+        self.status = status["status"]
+        self.done = status["done"]
+        self.total = status["total"]
+        self.current = status["current"]
+        self.error = status["error"]
+        self.partial_count = 0
+
+    @property
+    def result(self):
+        return self._queue.result(self.id)
+
+    def partial_rows(self):
+        return []
+
+
+def _queue_key(key):
+    return json.dumps(list(key))
+
+
+def queued_job(key, label, kind, payload, priority=0):
+    """
+    Seperti background_job, tetapi job dikirim ke antrean get_job_queue() dan
+    dikerjakan proses worker terpisah; halaman hanya submit lalu membaca status.
+    Hasil job adalah (DataFrame, meta) dari handler di program/worker.py.
+    """
+    queue = get_job_queue()
+    job_id = queue.submit(kind, payload, label=label, priority=priority, key=_queue_key(key))
+    return QueuedJob(queue, queue.status(job_id))
+
+
+def background_job(key, label, function, *args, **kwargs):
+    """
+    Job background untuk `key` (misalnya hash upload + nama proyek).
+
+    Job hanya disubmit sekali; rerun, halaman lain dan kunjungan berikutnya
+    mendapat job yang sama selama belum dibuang dengan clear_job_button.
+    `function` harus menerima keyword `progress` (lihat program/jobs.py).
+    """
+    manager = get_job_manager()
+    job = manager.find(key)
+    if job is None:
+        job = manager.submit(key, label, function, *args, **kwargs)
+    return job
+
+
+def clear_job_button(key, label="Clear cached results"):
+    """Tombol untuk membuang hasil job background sehingga analisis dijalankan ulang."""
+    if st.button(label):
+        get_job_manager().discard(key)
+        if get_job_queue() is not None:
+            get_job_queue().discard(_queue_key(key))
+        st.rerun()
+
+
+def wait_for_job(job, show_partial=None):
+    """
+    Tampilkan progress `job` dan kembalikan hasilnya jika sudah selesai.
+
+    Selama job berjalan, progress (file selesai / total, file terakhir) dan
+    `show_partial(rows, count)` untuk baris sementara terakhir (dari `count` baris
+    sejauh ini) ditampilkan, lalu halaman
+    di-rerun setelah JOB_POLL_SECONDS; fungsi ini tidak kembali dalam run itu.
+    Returns None jika job gagal (error ditampilkan).
+    """
+    if job.status == DONE:
+        return job.result
+    if job.status == FAILED:
+        st.error(f"Analysis failed: {job.error}")
+        return None
+
+    if job.total:
+        text = f"{job.label}: {job.done}/{job.total} files"
+        if job.current:
+            text += f" (last: {job.current})"
+        st.progress(job.done / job.total, text=text)
+    else:
+        st.progress(0.0, text=f"{job.label}: reading archive...")
+    st.caption(f"Job {job.id} runs in the background; you can switch pages and come back to the result.")
+
+    rows = job.partial_rows()
+    if show_partial is not None and rows:
+        show_partial(rows, job.partial_count)
+
+    time.sleep(JOB_POLL_SECONDS)
+    st.rerun()
@@ -0,0 +1,159 @@
+import dataclasses
+
+from kopyt import node
+
+# Tipe node -> nama field yang bisa berisi node anak (semua field kecuali posisi)
+_CHILD_FIELDS = {}
+# (kelas visitor, tipe node) -> fungsi visit_* yang cocok, atau None
+_HANDLERS = {}
+
+
+def child_fields(node_type):
+    """Nama field node anak untuk `node_type`, dihitung sekali per tipe."""
+    fields = _CHILD_FIELDS.get(node_type)
+    if fields is None:
+        if dataclasses.is_dataclass(node_type):
+            fields = tuple(f.name for f in dataclasses.fields(node_type) if f.name != "position")
+        else:
+            fields = ()
+        _CHILD_FIELDS[node_type] = fields
+    return fields
+
+
+def iter_children(current):
+    """Node anak langsung dari `current` sesuai urutan field-nya."""
+    for name in child_fields(type(current)):
+        value = getattr(current, name, None)
+        if isinstance(value, node.Node):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, node.Node):
+                    yield item
+
+
+class NodeVisitor:
+    """
+    Penelusur AST kopyt tanpa rekursi.
+
+    Subclass mendefinisikan `visit_<NamaTipe>` (misalnya `visit_Identifier`);
+    handler juga menangkap subclass tipe tersebut (`SimpleIdentifier`). Node
+    ditelusuri pre-order sesuai urutan source memakai stack eksplisit, jadi
+    ekspresi yang sangat dalam tidak terkena batas rekursi Python. Handler yang
+    mengembalikan False membuat anak-anak node itu dilewati.
+    """
+
+    def _handler(self, node_type):
+        key = (type(self), node_type)
+        try:
+            return _HANDLERS[key]
+        except KeyError:
+            pass
+        handler = None
+        for base in node_type.__mro__:
+            handler = getattr(type(self), f"visit_{base.__name__}", None)
+            if handler is not None:
+                break
+        _HANDLERS[key] = handler
+        return handler
+
+    def walk(self, root):
+        if root is None:
+            return self
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            handler = self._handler(type(current))
+            if handler is not None and handler(self, current) is False:
+                continue
+            children = list(iter_children(current))
+            children.reverse()
+            stack.extend(children)
+        return self
+
+
+class MethodWalker(NodeVisitor):
+    """
+    Satu penelusuran per method yang mengirim event ke semua metrik terdaftar.
+
+    Metrik cukup mendefinisikan callback yang dibutuhkannya:
+
+    - ``on_identifier(name)``: nama yang dirujuk langsung (bukan awal navigasi/pemanggilan)
+    - ``on_call(receiver, name, chained)``: pemanggilan ``name(...)``; ``receiver`` adalah
+      None untuk pemanggilan langsung, ``"this"``/``"super"``, nama variabel, atau nama
+      member sebelumnya jika ``chained`` (misalnya ``a.b().c()``)
+    - ``on_navigation(receiver, name, chained)``: akses member ``receiver.name`` tanpa pemanggilan
+    - ``on_declaration(name, kind)``: deklarasi lokal dengan ``kind`` ``"parameter"``,
+      ``"property"`` (val/var di body) atau ``"variable"`` (parameter lambda, variabel for, dll.)
+    """
+
+    EVENTS = ("on_identifier", "on_call", "on_navigation", "on_declaration")
+
+    def __init__(self, metrics):
+        self._callbacks = {
+            event: [getattr(metric, event) for metric in metrics if hasattr(metric, event)]
+            for event in self.EVENTS
+        }
+        # Node yang sudah dilaporkan lewat induknya, supaya tidak dilaporkan dua kali
+        self._reported = set()
+
+    def _emit(self, event, *args):
+        for callback in self._callbacks[event]:
+            callback(*args)
+
+    def visit_PostfixUnaryExpression(self, expr):
+        root = expr.expression
+        suffixes = expr.suffixes or ()
+        if isinstance(root, node.Identifier):
+            receiver = root.value
+            if suffixes and isinstance(suffixes[0], (node.NavigationSuffix, node.CallSuffix)):
+                self._reported.add(id(root))
+        elif isinstance(root, node.ThisExpression):
+            receiver = "this"
+        elif isinstance(root, node.SuperExpression):
+            receiver = "super"
+        else:
+            receiver = None
+
+        chained = False
+        for i, suffix in enumerate(suffixes):
+            if isinstance(suffix, node.NavigationSuffix):
+                name = suffix.suffix if isinstance(suffix.suffix, str) else None
+                if name is not None:
+                    is_call = i + 1 < len(suffixes) and isinstance(suffixes[i + 1], node.CallSuffix)
+                    self._emit("on_call" if is_call else "on_navigation", receiver, name, chained)
+                receiver = name
+            elif isinstance(suffix, node.CallSuffix):
+                if i == 0 and isinstance(root, node.Identifier):
+                    self._emit("on_call", None, root.value, False)
+            chained = True
+
+    def visit_Identifier(self, expr):
+        if id(expr) not in self._reported:
+            self._emit("on_identifier", expr.value)
+
+    def visit_PropertyDeclaration(self, declaration):
+        variables = declaration.declaration
+        if isinstance(variables, node.MultiVariableDeclaration):
+            variables = variables.sequence
+        else:
+            variables = (variables,)
+        for variable in variables:
+            if isinstance(variable, node.VariableDeclaration):
+                self._reported.add(id(variable))
+                self._emit("on_declaration", variable.name, "property")
+
+    def visit_VariableDeclaration(self, declaration):
+        if id(declaration) not in self._reported:
+            self._emit("on_declaration", declaration.name, "variable")
+
+    def visit_Parameter(self, parameter):
+        self._emit("on_declaration", parameter.name, "parameter")
+
+
+def walk_method(method_node, metrics):
+    """Telusuri parameter dan body `method_node` sekali, mengirim event ke semua `metrics`."""
+    walker = MethodWalker(metrics)
+    walker.walk(getattr(method_node, "parameters", None))
+    walker.walk(getattr(method_node, "body", None))
+    return metrics
@@ -0,0 +1,179 @@
+"""
+Worker untuk antrean job analisis (program/jobqueue.py), terpisah dari server Streamlit.
+
+Jalankan worker, lalu arahkan UI ke antrean yang sama lewat environment:
+    python -m program.worker run --queue /srv/kotlin-jobs --processes 4 --limit extract=2
+    KOTLIN_METRICS_JOB_QUEUE=/srv/kotlin-jobs streamlit run main.py
+
+Job juga bisa dikirim dan dipantau dari command line:
+    python -m program.worker submit uploads/app.zip --priority 5
+    python -m program.worker list
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from io import BytesIO
+
+from .jobqueue import DEFAULT_QUEUE_DIR, HEARTBEAT_SECONDS, JobQueue
+
+# Jeda antar pengecekan antrean saat tidak ada job
+POLL_SECONDS = 1.0
+
+
+def run_extract(payload, params, progress):
+    """Handler job "extract": controller.extract_and_parse pada arsip upload."""
+    from . import controller as ct
+    from .cache import ResultCache
+    from .guard import DEFAULT_BUDGET
+    from .profiling import PipelineStats
+
+    stats = PipelineStats()
+    cache = ResultCache()
+    df = ct.extract_and_parse(
+        BytesIO(payload),
+        workers=params.get("workers", 1),
+        cache=cache,
+        stats=stats,
+        budget=DEFAULT_BUDGET,
+        progress=progress,
+    )
+    cache.close()
+    # meta job ini adalah profil run plus statistik cache worker, sama seperti hasil index.extract_upload
+    return df, dict(stats.to_dict(), cache=cache.stats())
+
+
+# Jenis job -> handler(payload, params, progress) yang mengembalikan (DataFrame, meta)
+JOB_HANDLERS = {
+    "extract": run_extract,
+}
+
+
+def _heartbeat(queue, job_id, stop, interval=HEARTBEAT_SECONDS):
+    # Progress hanya tercatat per file; heartbeat ini menjaga job tetap "hidup" saat ingest
+    # atau satu file yang lama, supaya requeue_stale tidak menjalankan job ini dua kali
+    while not stop.wait(interval):
+        try:
+            queue.heartbeat(job_id)
+        except sqlite3.Error:
+            pass  # Database sibuk; coba lagi pada heartbeat berikutnya
+
+
+def run_job(queue, job):
+    handler = JOB_HANDLERS.get(job["kind"])
+    if handler is None:
+        queue.fail(job["id"], f"Unknown job kind: {job['kind']}")
+        return
+    stop = threading.Event()
+    beat = threading.Thread(target=_heartbeat, args=(queue, job["id"], stop), daemon=True)
+    beat.start()
+    try:
+        df, meta = handler(job["payload"], job["params"], queue.progress_callback(job["id"]))
+        queue.complete(job["id"], df, meta)
+    except Exception as e:
+        queue.fail(job["id"], f"{type(e).__name__}: {e}")
+    finally:
+        stop.set()
+        beat.join()
+
+
+def worker_loop(directory, poll_seconds=POLL_SECONDS, max_jobs=None):
+    """Ambil dan jalankan job sampai dihentikan (atau setelah `max_jobs` job)."""
+    queue = JobQueue(directory)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    finished = 0
+    while max_jobs is None or finished < max_jobs:
+        queue.requeue_stale()
+        job = queue.claim(worker_id, kinds=JOB_HANDLERS)
+        if job is None:
+            time.sleep(poll_seconds)
+            continue
+        run_job(queue, job)
+        finished += 1
+
+
+def run_workers(directory, processes, poll_seconds=POLL_SECONDS):
+    """Jalankan `processes` proses worker dan ganti yang mati sampai Ctrl+C atau SIGTERM."""
+    # SIGTERM (misalnya dari systemd/docker) dihentikan sama seperti Ctrl+C, termasuk proses anak
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    workers = []
+    try:
+        while True:
+            workers = [process for process in workers if process.is_alive()]
+            while len(workers) < processes:
+                process = multiprocessing.Process(target=worker_loop, args=(directory, poll_seconds))
+                process.start()
+                workers.append(process)
+            time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.join()
+
+
+def parse_limits(values):
+    limits = {}
+    for value in values or ():
+        kind, _, count = value.partition("=")
+        limits[kind] = int(count)
+    return limits
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m program.worker",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_DIR, help="Direktori antrean (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Jalankan proses worker")
+    run.add_argument("-p", "--processes", type=int, default=os.cpu_count() or 1,
+                     help="Jumlah proses worker (default: jumlah core)")
+    run.add_argument("--limit", action="append", metavar="KIND=N",
+                     help="Batas job berjalan bersamaan per jenis, misalnya extract=2")
+    run.add_argument("--poll", type=float, default=POLL_SECONDS, help="Jeda cek antrean (detik)")
+
+    submit = commands.add_parser("submit", help="Kirim arsip ZIP/RAR sebagai job extract")
+    submit.add_argument("archive")
+    submit.add_argument("--priority", type=int, default=0)
+
+    commands.add_parser("list", help="Tampilkan job terbaru")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "run":
+        queue = JobQueue(args.queue, limits=parse_limits(args.limit))
+        print(f"{args.processes} workers on {queue.directory}")
+        run_workers(args.queue, args.processes, args.poll)
+        return 0
+
+    queue = JobQueue(args.queue)
+    if args.command == "submit":
+        with open(args.archive, "rb") as f:
+            job_id = queue.submit("extract", f.read(), label=os.path.basename(args.archive),
+                                  priority=args.priority)
+        print(job_id)
+        return 0
+
+    for job in queue.jobs():
+        total = job["total"] if job["total"] is not None else "?"
+        print(f"{job['id']}  {job['status']:8} p{job['priority']:<3} {job['done']}/{total}  "
+              f"{job['label']}  {job['error'] or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())